@@ -0,0 +1,52 @@
+import threading
+
+from db_importacao import importar_catalogo
+from db_manutencao import iniciar_agendador
+from db_migracoes import aplicar_migracoes
+from db_recarga import iniciar_recarga
+from repositorios.bosses import completar_campos_numericos
+from repositorios.jornadas import completar_jornadas
+
+# === Inicialização única do banco por processo ===
+# O Streamlit reexecuta as páginas a cada interação; este módulo fica em cache
+# em sys.modules, então o esquema e a carga dos CSVs acontecem uma só vez.
+
+_lock = threading.Lock()
+_inicializado = False
+_segundo_plano_iniciado = False
+
+
+def _preparar_banco():
+    """Migrações, importação dos CSVs alterados e campos derivados, uma vez por processo."""
+    global _inicializado
+    if _inicializado:
+        return
+
+    # Sessões simultâneas esperam a primeira terminar em vez de repetir o trabalho
+    with _lock:
+        if _inicializado:
+            return
+
+        aplicar_migracoes()
+        resumos = importar_catalogo()
+        completar_campos_numericos()
+        if any(resumo.inseridas for resumo in resumos):
+            completar_jornadas()  # bosses novos entram nas jornadas existentes
+
+        _inicializado = True
+
+
+def inicializar_banco(segundo_plano=True):
+    """
+    Aplica as migrações e importa os CSVs do catálogo alterados (completando as jornadas). Idempotente.
+
+    Com `segundo_plano` (o app), inicia também as threads de manutenção e de
+    recarga dos CSVs. Comandos de execução única (db_gestao) passam False:
+    o processo termina logo e mataria uma tarefa dessas no meio.
+    """
+    global _segundo_plano_iniciado
+    _preparar_banco()
+    if segundo_plano and not _segundo_plano_iniciado:
+        iniciar_agendador()
+        iniciar_recarga()
+        _segundo_plano_iniciado = True
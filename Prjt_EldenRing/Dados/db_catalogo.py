@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from db_backend import eh_sqlite
+from db_conexao import conectar
+from db_metricas import fabrica_conexao
+
+# === Réplica em memória do catálogo ===
+# bosses, boss_levels, boss_loot, pacotes, weapons e weapon_tipos são lidos
+# a cada rerun, mas só mudam quando um admin edita um boss ou um CSV é
+# reimportado. Só essas tabelas (com seus índices) são copiadas para um banco
+# em memória compartilhado pelo processo, e as leituras do catálogo vão para
+# ele, sem tocar no disco nem disputar com as escritas da jornada.
+#
+# Cada cópia é uma "geração" com nome próprio: a nova é montada por inteiro
+# e só então publicada; leitores ainda na geração anterior passam para a
+# nova na próxima chamada. A troca é disparada pelo contador catalogo_versao,
+# mantido por gatilhos no banco principal (migração 003). Durante uma
+# importação em vários blocos (catalogo_congelado) a geração atual é mantida,
+# e a próxima leitura depois dela publica o catálogo já completo.
+
+TABELAS_CATALOGO = ("bosses", "boss_levels", "boss_loot", "pacotes", "weapons", "weapon_tipos")
+INTERVALO_VERIFICACAO_S = 2.0  # frequência máxima de consulta ao contador em disco
+REPLICA_ATIVA = eh_sqlite() and os.environ.get("ELDEN_REPLICA_CATALOGO", "1") == "1"
+
+_lock = threading.Lock()              # publicação da geração e abertura de conexões
+_lock_atualizacao = threading.Lock()  # uma cópia por vez
+_local = threading.local()
+
+_geracao = 0
+_ancora = None            # conexão que mantém a geração atual viva
+_versao_replicada = None
+_ultima_verificacao = 0.0
+_congelamentos = 0        # importações em andamento (troca de geração suspensa)
+
+
+def _uri(geracao):
+    return f"file:elden_catalogo_{geracao}?mode=memory&cache=shared"
+
+
+def _esquema(geracao):
+    return f"replica_g{geracao}"
+
+
+# === Atualização ===
+def _montar_geracao(geracao):
+    """Copia só as tabelas do catálogo (esquema, índices e linhas) para uma nova geração em memória."""
+    nova = sqlite3.connect(_uri(geracao), uri=True, check_same_thread=False, isolation_level=None)
+    arquivo = next(linha[2] for linha in conectar().execute("PRAGMA database_list") if linha[1] == "main")
+    origem = Path(arquivo).as_uri() + "?mode=ro"
+    nova.execute(f"ATTACH DATABASE '{origem}' AS origem")
+
+    # Uma transação de leitura: todas as tabelas e a versão vêm do mesmo instante
+    nova.execute("BEGIN")
+    versao = nova.execute("SELECT versao FROM origem.catalogo_versao WHERE id = 1").fetchone()[0]
+    marcadores = ", ".join("?" * len(TABELAS_CATALOGO))
+    objetos = nova.execute(f"""
+        SELECT type, name, sql FROM origem.sqlite_master
+        WHERE type IN ('table', 'index') AND tbl_name IN ({marcadores}) AND sql IS NOT NULL
+        ORDER BY type = 'index'
+    """, TABELAS_CATALOGO).fetchall()
+    for tipo, nome, sql in objetos:
+        nova.execute(sql)
+        if tipo == "table":
+            # Colunas geradas (ex.: bosses.chave) são recalculadas, não copiadas
+            colunas = ", ".join(
+                linha[1] for linha in nova.execute(f"PRAGMA origem.table_xinfo({nome})") if linha[6] == 0
+            )
+            nova.execute(f"INSERT INTO main.{nome} ({colunas}) SELECT {colunas} FROM origem.{nome}")
+    nova.execute("COMMIT")
+    nova.execute("DETACH DATABASE origem")
+    return nova, versao
+
+
+def _garantir_atualizada():
+    """Renova a réplica se o catálogo em disco mudou (verifica no máximo a cada intervalo)."""
+    global _geracao, _ancora, _versao_replicada, _ultima_verificacao
+
+    if _ancora is not None and (_congelamentos or time.monotonic() - _ultima_verificacao < INTERVALO_VERIFICACAO_S):
+        return
+
+    with _lock_atualizacao:
+        if _ancora is not None and (_congelamentos or time.monotonic() - _ultima_verificacao < INTERVALO_VERIFICACAO_S):
+            return
+
+        versao = conectar().execute("SELECT versao FROM catalogo_versao WHERE id = 1").fetchone()[0]
+        if _ancora is None or versao != _versao_replicada:
+            nova, versao = _montar_geracao(_geracao + 1)
+            with _lock:
+                antiga = _ancora
+                _geracao, _ancora, _versao_replicada = _geracao + 1, nova, versao
+            if antiga is not None:
+                # Leitores ainda conectados mantêm a geração antiga até trocarem de geração
+                antiga.close()
+        _ultima_verificacao = time.monotonic()
+
+
+def invalidar_catalogo():
+    """Força a verificação do catálogo na próxima leitura (após escritas no catálogo)."""
+    global _ultima_verificacao
+    _ultima_verificacao = 0.0
+
+
+@contextmanager
+def catalogo_congelado():
+    """
+    Mantém a geração atual da réplica enquanto o bloco roda (importações em lotes).
+
+    Leitores não veem o catálogo pela metade; ao sair, a próxima leitura troca
+    para uma geração com todas as alterações de uma vez.
+    """
+    global _congelamentos
+    with _lock_atualizacao:  # espera uma cópia em andamento terminar
+        _congelamentos += 1
+    try:
+        yield
+    finally:
+        with _lock_atualizacao:
+            _congelamentos -= 1
+        invalidar_catalogo()
+
+
+# === Leitura ===
+def conectar_catalogo():
+    """
+    Conexão somente leitura com a réplica em memória do catálogo.
+
+    Sem a réplica (ELDEN_REPLICA_CATALOGO=0 ou backend PostgreSQL), devolve a
+    conexão do banco principal.
+    """
+    if not REPLICA_ATIVA:
+        return conectar()
+
+    _garantir_atualizada()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.geracao == _geracao:
+        return conn
+
+    with _lock:
+        # Aberta sob o lock: a âncora ainda está viva e o banco em memória existe
+        nova = sqlite3.connect(_uri(_geracao), uri=True, check_same_thread=False, factory=fabrica_conexao())
+        geracao = _geracao
+    nova.execute("PRAGMA query_only = ON")
+    if conn is not None:
+        conn.close()
+    _local.conn, _local.geracao = nova, geracao
+    return nova
+
+
+def tabelas_catalogo(conn, *tabelas):
+    """
+    Nomes das tabelas do catálogo para joins feitos em `conn` (banco principal ou shard).
+
+    Com a réplica ativa, anexa a geração atual à conexão e devolve os nomes
+    qualificados (ex.: `replica_g3.boss_levels`), todos da mesma geração;
+    gerações antigas são desanexadas. Uma consulta deve usar nomes de uma
+    única chamada: uma chamada posterior pode desanexar a geração anterior.
+    """
+    if not REPLICA_ATIVA:
+        return tabelas
+
+    _garantir_atualizada()
+    with _lock:
+        geracao = _geracao
+        anexados = [linha[1] for linha in conn.execute("PRAGMA database_list")]
+        if _esquema(geracao) not in anexados:
+            conn.execute(f"ATTACH DATABASE '{_uri(geracao)}' AS {_esquema(geracao)}")
+
+    for nome in anexados:
+        if nome.startswith("replica_g") and nome != _esquema(geracao):
+            conn.execute(f"DETACH DATABASE {nome}")
+    return tuple(f"{_esquema(geracao)}.{tabela}" for tabela in tabelas)
@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+from db_backend import abrir_conexao_postgres, eh_sqlite
+from db_metricas import fabrica_conexao
+
+# === Caminho do banco de dados ===
+DB_PATH = Path(__file__).resolve().parent / "dados.db"
+
+# === Parâmetros das conexões ===
+BUSY_TIMEOUT_S = 15           # espera pelo lock de escrita antes de "database is locked"
+CACHE_STATEMENTS = 256        # statements preparados mantidos por conexão
+CACHE_SIZE_KIB = 16384        # cache de páginas por conexão (16 MiB)
+MMAP_SIZE = 256 * 1024 * 1024 # leitura via memória mapeada (256 MiB)
+MAX_CONEXOES_OCIOSAS = 8      # conexões reaproveitáveis por banco após o fim das threads
+MAX_SHARDS_POR_THREAD = 4     # shards abertos por thread; o usado há mais tempo é fechado
+MAX_SHARDS_OCIOSOS = 16       # conexões de shards no pool, somando todos os shards
+
+_local = threading.local()
+_lock = threading.Lock()
+_em_uso = {}   # thread -> {caminho: conexão}
+_ociosas = {}  # caminho -> conexões liberadas (shards na ordem de uso: o mais antigo primeiro)
+
+
+def _abrir_conexao(caminho):
+    """Abre uma nova conexão já configurada com os PRAGMAs de desempenho."""
+    if not eh_sqlite():
+        return abrir_conexao_postgres()
+
+    conn = sqlite3.connect(
+        Path(caminho).resolve().as_uri(),
+        uri=True,
+        timeout=BUSY_TIMEOUT_S,
+        cached_statements=CACHE_STATEMENTS,
+        check_same_thread=False,  # a conexão muda de thread apenas ao voltar para o pool
+        factory=fabrica_conexao(),
+    )
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    # Exclusões de personagem apagam jornada e builds em cascata (migração 010)
+    conn.execute("PRAGMA foreign_keys = ON")
+
+    # Shards de usuário enxergam o banco principal (catálogo) somente para leitura;
+    # nomes não qualificados como `bosses` são resolvidos nele por não existirem no shard.
+    if Path(caminho).resolve() != Path(DB_PATH).resolve():
+        catalogo = Path(DB_PATH).resolve().as_uri() + "?mode=ro"
+        conn.execute("ATTACH DATABASE ? AS catalogo", (catalogo,))
+    return conn
+
+
+def _eh_shard(caminho):
+    return eh_sqlite() and caminho != str(DB_PATH)
+
+
+def _guardar_ociosa(caminho, conn):
+    """
+    Devolve a conexão ao pool (chamar com _lock).
+
+    Cada shard aberto é um arquivo (e o catálogo anexado) a mais: o pool
+    guarda no máximo MAX_SHARDS_OCIOSOS conexões de shards e fecha as dos
+    shards usados há mais tempo. O banco principal fica com até
+    MAX_CONEXOES_OCIOSAS conexões.
+    """
+    if conn.in_transaction:
+        conn.rollback()
+    ociosas = _ociosas.pop(caminho, [])
+    _ociosas[caminho] = ociosas  # fim da ordem: usado agora
+    if len(ociosas) >= MAX_CONEXOES_OCIOSAS:
+        conn.close()
+        return
+    ociosas.append(conn)
+
+    shards = [c for c in _ociosas if _eh_shard(c)]
+    excedentes = sum(len(_ociosas[c]) for c in shards) - MAX_SHARDS_OCIOSOS
+    for antigo in shards:
+        while excedentes > 0 and _ociosas[antigo]:
+            _ociosas[antigo].pop(0).close()
+            excedentes -= 1
+        if not _ociosas[antigo]:
+            del _ociosas[antigo]
+
+
+def _recolher_conexoes_orfas():
+    """Devolve ao pool as conexões de threads que já terminaram (chamar com _lock)."""
+    for thread in [t for t in _em_uso if not t.is_alive()]:
+        for caminho, conn in _em_uso.pop(thread).items():
+            _guardar_ociosa(caminho, conn)
+
+
+def _fechar_shards_antigos(conexoes):
+    """Fecha os shards da thread além de MAX_SHARDS_POR_THREAD, do usado há mais tempo."""
+    # Fechados, não devolvidos ao pool: outra thread nunca recebe uma conexão
+    # que um chamador desta ainda guarde
+    shards = [c for c in conexoes if _eh_shard(c)]
+    for caminho in shards[:-MAX_SHARDS_POR_THREAD]:
+        conn = conexoes[caminho]
+        if conn.in_transaction:
+            continue
+        del conexoes[caminho]
+        with _lock:
+            _em_uso.get(threading.current_thread(), {}).pop(caminho, None)
+        conn.close()
+
+
+def conectar(caminho=None):
+    """
+    Retorna a conexão da thread atual com o banco, reaproveitando conexões do pool.
+
+    Sem `caminho`, usa o banco principal (DB_PATH, ou o servidor configurado
+    em db_backend quando ELDEN_BACKEND=postgres). Use como
+    `with conectar() as conn:` — o bloco faz commit/rollback da transação,
+    mas a conexão permanece aberta para as próximas chamadas.
+    """
+    caminho = str(caminho or DB_PATH) if eh_sqlite() else "postgres"
+    conexoes = _local.__dict__.setdefault("conexoes", {})
+    conn = conexoes.get(caminho)
+    if conn is not None:
+        if _eh_shard(caminho):
+            conexoes[caminho] = conexoes.pop(caminho)  # fim da ordem: usado agora
+        return conn
+
+    with _lock:
+        _recolher_conexoes_orfas()
+        ociosas = _ociosas.get(caminho)
+        conn = ociosas.pop() if ociosas else None
+    if conn is None:
+        conn = _abrir_conexao(caminho)
+
+    with _lock:
+        _em_uso.setdefault(threading.current_thread(), {})[caminho] = conn
+    conexoes[caminho] = conn
+    if _eh_shard(caminho):
+        _fechar_shards_antigos(conexoes)
+    return conn
+
+
+def fechar_conexoes():
+    """Fecha todas as conexões do pool (encerramento do processo ou testes)."""
+    with _lock:
+        for conexoes in list(_em_uso.values()) + list(_ociosas.values()):
+            for conn in (conexoes.values() if isinstance(conexoes, dict) else conexoes):
+                conn.close()
+        _em_uso.clear()
+        _ociosas.clear()
+    _local.__dict__.clear()
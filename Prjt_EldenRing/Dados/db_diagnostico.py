@@ -0,0 +1,124 @@
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+import db_conexao
+from db_conexao import conectar
+from db_metricas import consultas_mais_lentas, consultas_registradas
+
+# === Diagnóstico do banco (página de administração) ===
+# Tamanho em disco por tabela e índice (tabela virtual dbstat), uso dos
+# índices pelas consultas registradas (EXPLAIN QUERY PLAN), WAL, páginas
+# livres e a última atualização de estatísticas. Apenas SQLite.
+
+
+class ResumoArquivo(NamedTuple):
+    banco: str
+    tamanho_bytes: int
+    wal_bytes: int
+    tamanho_pagina: int
+    paginas_livres: int
+    bytes_livres: int
+    ultimo_analyze: str
+
+
+def _caminho(caminho):
+    return Path(caminho or db_conexao.DB_PATH)
+
+
+def resumo_arquivo(caminho=None):
+    """Tamanho do arquivo e do WAL, páginas livres e data do último ANALYZE registrado."""
+    caminho = _caminho(caminho)
+    conn = conectar(caminho)
+    tamanho_pagina = conn.execute("PRAGMA main.page_size").fetchone()[0]
+    paginas_livres = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+    wal = Path(f"{caminho}-wal")
+    return ResumoArquivo(
+        banco=caminho.name,
+        tamanho_bytes=caminho.stat().st_size if caminho.exists() else 0,
+        wal_bytes=wal.stat().st_size if wal.exists() else 0,
+        tamanho_pagina=tamanho_pagina,
+        paginas_livres=paginas_livres,
+        bytes_livres=paginas_livres * tamanho_pagina,
+        ultimo_analyze=ultimo_analyze(caminho),
+    )
+
+
+def ultimo_analyze(caminho=None):
+    """Data da última otimização registrada em manutencao_log para o banco (ou None)."""
+    with conectar() as conn:
+        linha = conn.execute("""
+            SELECT MAX(iniciada_em) FROM manutencao_log
+            WHERE tarefa = 'otimizar' AND banco = ? AND detalhe NOT LIKE '[ERRO]%'
+        """, (_caminho(caminho).name,)).fetchone()
+    return linha[0]
+
+
+def tamanho_tabelas(caminho=None):
+    """Linhas e bytes em disco (dados e índices) de cada tabela, da maior para a menor."""
+    conn = conectar(_caminho(caminho))
+    objetos = pd.read_sql_query("""
+        SELECT s.name AS objeto, COALESCE(m.tbl_name, s.name) AS tabela,
+               COALESCE(m.type, 'table') AS tipo, SUM(s.pgsize) AS bytes
+        FROM dbstat('main') s
+        LEFT JOIN main.sqlite_master m ON m.name = s.name
+        GROUP BY s.name
+    """, conn)
+
+    tabelas = objetos.pivot_table(index="tabela", columns="tipo", values="bytes", aggfunc="sum", fill_value=0)
+    tabelas = tabelas.reindex(columns=["table", "index"], fill_value=0)
+    tabelas.columns = ["bytes_dados", "bytes_indices"]
+    tabelas = tabelas.reset_index()
+
+    tabelas["linhas"] = [
+        conn.execute(f'SELECT COUNT(*) FROM main."{tabela}"').fetchone()[0]
+        if not tabela.startswith("sqlite_") else None
+        for tabela in tabelas["tabela"]
+    ]
+    tabelas["linhas"] = tabelas["linhas"].astype("Int64")
+    tabelas["bytes_total"] = tabelas["bytes_dados"] + tabelas["bytes_indices"]
+    return tabelas[["tabela", "linhas", "bytes_dados", "bytes_indices", "bytes_total"]] \
+        .sort_values("bytes_total", ascending=False, ignore_index=True)
+
+
+def _indices_do_plano(conn, sql):
+    """Índices citados no plano de execução da consulta (parâmetros como NULL)."""
+    parametros = (None,) * sql.count("?")
+    try:
+        plano = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+    except Exception:
+        return set()  # consulta de outro banco ou com tabelas que não existem aqui
+    return {m.group(1) for linha in plano for m in re.finditer(r"USING (?:COVERING )?INDEX (\w+)", linha[-1])}
+
+
+def uso_indices(caminho=None):
+    """Índices do banco com quantas execuções registradas os usaram, segundo o plano atual."""
+    conn = conectar(_caminho(caminho))
+    indices = pd.read_sql_query("""
+        SELECT name AS indice, tbl_name AS tabela, COALESCE(sql, '(automático)') AS definicao
+        FROM main.sqlite_master
+        WHERE type = 'index'
+        ORDER BY tbl_name, name
+    """, conn)
+
+    usos = {}
+    consultas = {}
+    for consulta in consultas_registradas():
+        for indice in _indices_do_plano(conn, consulta.sql):
+            usos[indice] = usos.get(indice, 0) + consulta.execucoes
+            consultas[indice] = consultas.get(indice, 0) + 1
+
+    indices["consultas"] = indices["indice"].map(consultas).fillna(0).astype(int)
+    indices["execucoes"] = indices["indice"].map(usos).fillna(0).astype(int)
+    return indices
+
+
+def consultas_lentas(limite=20):
+    """DataFrame com as consultas de maior tempo médio registradas neste processo."""
+    return pd.DataFrame(
+        consultas_mais_lentas(limite),
+        columns=["sql", "execucoes", "total_ms", "media_ms", "maior_ms"],
+    )
+
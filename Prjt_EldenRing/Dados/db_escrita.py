@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import NamedTuple
+
+from db_backend import iniciar_escrita
+from db_conexao import conectar
+
+# === Escritor único em segundo plano ===
+# Todas as sessões enfileiram suas escritas aqui; uma única thread as aplica
+# em lotes (group commit), então as sessões não disputam o lock de escrita
+# do SQLite entre si. Cada operação roda em um SAVEPOINT próprio: a falha de
+# uma não desfaz as demais do lote. No modo shards, o lote é separado por
+# banco de destino e cada banco recebe seu próprio commit.
+
+TAMANHO_FILA = 1024   # escritas pendentes antes de o chamador bloquear
+LOTE_MAXIMO = 64      # operações por commit
+
+_fila = queue.Queue(maxsize=TAMANHO_FILA)
+_lock = threading.Lock()
+_thread = None
+
+_estatisticas = {
+    "operacoes": 0,
+    "falhas": 0,
+    "commits": 0,
+    "maior_lote": 0,
+    "latencia_total_ms": 0.0,
+    "ultima_latencia_ms": 0.0,
+}
+
+
+class EstatisticasEscrita(NamedTuple):
+    profundidade_fila: int
+    operacoes: int
+    falhas: int
+    commits: int
+    maior_lote: int
+    ultima_latencia_ms: float
+    media_latencia_ms: float
+
+
+def _garantir_escritor():
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_laco_escritor, name="escritor-sqlite", daemon=True)
+            _thread.start()
+
+
+def enfileirar_escrita(operacao, *args, banco=None):
+    """
+    Agenda `operacao(conn, *args)` no escritor e devolve um Future com o retorno.
+
+    `banco` é o caminho do banco de destino (o principal por padrão).
+    A operação não deve chamar commit/rollback: o escritor controla a transação.
+    Com a fila cheia, o chamador espera por espaço (contrapressão).
+    """
+    _garantir_escritor()
+    futuro = Future()
+    _fila.put((banco, operacao, args, futuro))
+    return futuro
+
+
+def executar_escrita(operacao, *args, banco=None, timeout=None):
+    """Enfileira a escrita e aguarda o commit; propaga a exceção da operação, se houver."""
+    return enfileirar_escrita(operacao, *args, banco=banco).result(timeout)
+
+
+def _executar_sql(conn, sql, parametros):
+    return conn.execute(sql, parametros).rowcount
+
+
+def _executar_sql_em_lote(conn, sql, lista_parametros):
+    return conn.executemany(sql, lista_parametros).rowcount
+
+
+def escrever(sql, parametros=(), banco=None):
+    """Executa um único comando SQL pelo escritor e devolve o número de linhas afetadas."""
+    return executar_escrita(_executar_sql, sql, parametros, banco=banco)
+
+
+def escrever_em_lote(sql, lista_parametros, banco=None):
+    """Executa o comando para cada conjunto de parâmetros (executemany) pelo escritor."""
+    return executar_escrita(_executar_sql_em_lote, sql, list(lista_parametros), banco=banco)
+
+
+def estatisticas_escrita():
+    """Profundidade atual da fila e métricas acumuladas de commit."""
+    with _lock:
+        commits = _estatisticas["commits"]
+        return EstatisticasEscrita(
+            profundidade_fila=_fila.qsize(),
+            operacoes=_estatisticas["operacoes"],
+            falhas=_estatisticas["falhas"],
+            commits=commits,
+            maior_lote=_estatisticas["maior_lote"],
+            ultima_latencia_ms=_estatisticas["ultima_latencia_ms"],
+            media_latencia_ms=_estatisticas["latencia_total_ms"] / commits if commits else 0.0,
+        )
+
+
+def _laco_escritor():
+    while True:
+        lote = [_fila.get()]
+        while len(lote) < LOTE_MAXIMO:
+            try:
+                lote.append(_fila.get_nowait())
+            except queue.Empty:
+                break
+
+        # Agrupa por banco de destino, preservando a ordem de chegada em cada um
+        por_banco = {}
+        for banco, operacao, args, futuro in lote:
+            por_banco.setdefault(str(banco or ""), []).append((operacao, args, futuro))
+        for banco, operacoes in por_banco.items():
+            try:
+                _gravar_lote(banco or None, operacoes)
+            except Exception as e:
+                # Falha inesperada: quem ainda espera recebe o erro e o escritor segue vivo
+                _falhar(banco or None, operacoes, e)
+
+
+def _falhar(banco, lote, erro):
+    """Desfaz a transação aberta no banco (se houver) e entrega o erro às operações ainda pendentes."""
+    try:
+        conectar(banco).rollback()
+    except Exception:
+        pass
+    for _, _, futuro in lote:
+        if not futuro.done():
+            futuro.set_exception(erro)
+
+
+def _gravar_lote(banco, lote):
+    """Aplica um lote de operações em uma única transação no banco e resolve os Futures."""
+    inicio = time.perf_counter()
+    resultados = []
+
+    try:
+        # Banco inacessível (shard inválido, ATTACH do catálogo falhou): só este lote falha
+        conn = conectar(banco)
+        iniciar_escrita(conn)
+    except Exception as e:
+        _falhar(banco, lote, e)
+        _registrar(len(lote), len(lote), None)
+        return
+
+    for operacao, args, futuro in lote:
+        if not futuro.set_running_or_notify_cancel():
+            continue
+        conn.execute("SAVEPOINT escrita")
+        try:
+            retorno = operacao(conn, *args)
+            conn.execute("RELEASE SAVEPOINT escrita")
+            resultados.append((futuro, retorno, None))
+        except Exception as e:
+            conn.execute("ROLLBACK TO SAVEPOINT escrita")
+            conn.execute("RELEASE SAVEPOINT escrita")
+            resultados.append((futuro, None, e))
+
+    try:
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        resultados = [(futuro, None, e) for futuro, _, _ in resultados]
+
+    latencia_ms = (time.perf_counter() - inicio) * 1000
+    falhas = sum(1 for _, _, erro in resultados if erro is not None)
+    _registrar(len(resultados), falhas, latencia_ms)
+
+    for futuro, retorno, erro in resultados:
+        if erro is None:
+            futuro.set_result(retorno)
+        else:
+            futuro.set_exception(erro)
+
+
+def _registrar(operacoes, falhas, latencia_ms):
+    with _lock:
+        _estatisticas["operacoes"] += operacoes
+        _estatisticas["falhas"] += falhas
+        _estatisticas["maior_lote"] = max(_estatisticas["maior_lote"], operacoes)
+        if latencia_ms is not None:
+            _estatisticas["commits"] += 1
+            _estatisticas["latencia_total_ms"] += latencia_ms
+            _estatisticas["ultima_latencia_ms"] = latencia_ms
@@ -1,14 +1,57 @@
-import sqlite3
-import os
+import argparse
 
-# Caminho do banco
-BASE_DIR = os.path.dirname(__file__)
-DB_PATH = os.path.join(BASE_DIR, 'dados.db')
+from db_bootstrap import inicializar_banco
+from db_importacao import formatar_resumo, importar_catalogo
+from db_manutencao import (
+    TAREFAS, checkpoint_wal, executar_manutencao, fazer_backup,
+    formatar_relatorio, otimizar, vacuo_incremental,
+)
+from repositorios.jornadas import completar_jornadas, limpar_jornadas
 
-# Conexão e limpeza
-with sqlite3.connect(DB_PATH) as conn:
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM jornada")
-    conn.commit()
+# === Gestão do banco pela linha de comando ===
+# Uso: python db_gestao.py <comando>
+#   manutencao        ciclo completo (backup, otimizar, vácuo, checkpoint) em todos os bancos
+#   backup | otimizar | vacuo | checkpoint   apenas a tarefa indicada
+#   importar [--forcar]                      reimporta os CSVs do catálogo alterados (todos, com --forcar)
+#   completar-jornadas                       inclui em todas as jornadas os bosses que faltam
+#   limpar-jornada --confirmar               apaga todas as jornadas e seus resumos (em todos os bancos de usuário)
 
-print("✅ Todas as linhas da tabela 'jornada' foram apagadas com sucesso.")
+COMANDOS = {
+    "backup": fazer_backup,
+    "otimizar": otimizar,
+    "vacuo": vacuo_incremental,
+    "checkpoint": checkpoint_wal,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do banco de dados do Elden Ring.")
+    parser.add_argument("comando", choices=["manutencao", *COMANDOS, "importar", "completar-jornadas", "limpar-jornada"])
+    parser.add_argument("--confirmar", action="store_true", help="necessário para comandos destrutivos")
+    parser.add_argument("--forcar", action="store_true", help="importar: ignora o hash e compara todos os CSVs")
+    args = parser.parse_args()
+
+    # Sem agendador nem recarga: o comando roda sozinho e termina
+    inicializar_banco(segundo_plano=False)
+
+    if args.comando == "importar":
+        print(formatar_resumo(importar_catalogo(forcar=args.forcar)))
+        return
+
+    if args.comando == "completar-jornadas":
+        print(f"✅ {completar_jornadas()} linha(s) incluída(s) nas jornadas.")
+        return
+
+    if args.comando == "limpar-jornada":
+        if not args.confirmar:
+            parser.error("limpar-jornada apaga todas as jornadas; repita com --confirmar")
+        removidas = limpar_jornadas()
+        print(f"✅ {removidas} linha(s) da tabela 'jornada' apagada(s) com sucesso.")
+        return
+
+    tarefas = TAREFAS if args.comando == "manutencao" else [COMANDOS[args.comando]]
+    print(formatar_relatorio(executar_manutencao(tarefas)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import hashlib
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import pandas as pd
+
+from db_backend import ERROS_BANCO
+from db_catalogo import catalogo_congelado, invalidar_catalogo
+from db_conexao import conectar
+from db_escrita import executar_escrita
+from repositorios import bosses, weapons
+
+# === Importação incremental dos CSVs do catálogo ===
+# Um único fluxo para os três CSVs: o SHA-256 de cada arquivo fica em
+# importacao_csv e arquivos com o mesmo hash da última importação são
+# ignorados sem serem lidos. Arquivos alterados são lidos em blocos de
+# TAMANHO_BLOCO linhas e comparados pela chave natural (sem espaços nas
+# pontas e sem diferença de caixa) com o que já está no banco: linhas
+# novas são inseridas, linhas diferentes atualizadas e as iguais, mantidas.
+# O gancho `relacionar` mantém as tabelas ligadas: o loot de cada boss em
+# boss_loot e os tipos de cada arma em weapon_tipos.
+# Linhas que existem só no banco (cadastradas pela página) não são apagadas.
+
+TAMANHO_BLOCO = 500              # linhas do CSV processadas e gravadas por vez
+BYTES_LEITURA_HASH = 1024 * 1024
+
+
+class FonteCsv(NamedTuple):
+    arquivo: Path
+    tabela: str
+    chave: tuple        # colunas da chave natural
+    colunas: tuple      # colunas gravadas na tabela
+    preparar: Callable  # bloco do CSV -> DataFrame com `colunas`
+    relacionar: Callable = None  # (conn, bloco preparado): grava tabelas ligadas, após o upsert
+
+
+class ResumoImportacao(NamedTuple):
+    arquivo: str
+    situacao: str       # importado | inalterado | ausente | erro
+    inseridas: int
+    atualizadas: int
+    inalteradas: int
+    duracao_ms: float
+
+
+FONTES = [
+    FonteCsv(
+        Path(bosses.CSV_PATH), "bosses", ("localidade", "nome"),
+        ("nome", "localidade", "location", "runes", "loot", "stance", "stance_valor",
+         "tipo_dano_pref", "resistencia", "fraquezas", "resistencias", "pacote"),
+        bosses.preparar_bosses, bosses.relacionar_loot,
+    ),
+    FonteCsv(
+        Path(bosses.CSV_LEVELS_PATH), "boss_levels", ("localidade", "nome"),
+        ("localidade", "nome", "level", "level_ord", "level_min", "level_max"),
+        bosses.preparar_boss_levels,
+    ),
+    FonteCsv(
+        weapons.CSV_PATH, "weapons", ("name",), ("name", *weapons.ATRIBUTOS),
+        weapons.preparar_weapons, weapons.gravar_tipos_weapons,
+    ),
+]
+
+
+def hash_arquivo(caminho):
+    """SHA-256 do arquivo, lido em blocos."""
+    resumo = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(BYTES_LEITURA_HASH), b""):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def _valor(valor):
+    """Valor do pandas como tipo Python (NaN/NA -> None), para gravar e comparar."""
+    if not isinstance(valor, str) and pd.isna(valor):
+        return None
+    return valor.item() if hasattr(valor, "item") else valor
+
+
+def _chave_natural(valores):
+    return tuple(None if v is None else str(v).strip().lower() for v in valores)
+
+
+def _linhas_existentes(conn, fonte):
+    """Chave natural -> (id, valores) das linhas já gravadas na tabela."""
+    posicoes = [fonte.colunas.index(coluna) for coluna in fonte.chave]
+    linhas = conn.execute(f"SELECT id, {', '.join(fonte.colunas)} FROM {fonte.tabela}").fetchall()
+    return {
+        _chave_natural(linha[1:][i] for i in posicoes): (linha[0], tuple(linha[1:]))
+        for linha in linhas
+    }
+
+
+def _gravar_bloco(conn, fonte, inserir, atualizar, preparado):
+    """Insere e atualiza as linhas do bloco; devolve as linhas inseridas (com id)."""
+    colunas = ", ".join(fonte.colunas)
+    ultimo_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {fonte.tabela}").fetchone()[0]
+    if inserir:
+        conn.executemany(
+            f"INSERT INTO {fonte.tabela} ({colunas}) VALUES ({', '.join('?' * len(fonte.colunas))})",
+            inserir,
+        )
+    if atualizar:
+        conn.executemany(
+            f"UPDATE {fonte.tabela} SET {', '.join(f'{c} = ?' for c in fonte.colunas)} WHERE id = ?",
+            atualizar,
+        )
+    if fonte.relacionar:
+        fonte.relacionar(conn, preparado)
+    return conn.execute(f"SELECT id, {colunas} FROM {fonte.tabela} WHERE id > ?", (ultimo_id,)).fetchall()
+
+
+def _registrar_importacao(conn, arquivo, hash_atual, inseridas, atualizadas, inalteradas):
+    conn.execute("""
+        INSERT INTO importacao_csv (arquivo, hash, importado_em, inseridas, atualizadas, inalteradas)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (arquivo) DO UPDATE SET
+            hash = excluded.hash, importado_em = excluded.importado_em,
+            inseridas = excluded.inseridas, atualizadas = excluded.atualizadas,
+            inalteradas = excluded.inalteradas
+    """, (arquivo, hash_atual, datetime.now().isoformat(timespec="seconds"), inseridas, atualizadas, inalteradas))
+
+
+# === Importação ===
+def importar_arquivo(fonte, forcar=False):
+    """Importa um CSV do catálogo se o hash mudou (ou com `forcar`) e devolve o resumo."""
+    inicio = time.perf_counter()
+    nome = fonte.arquivo.name
+
+    def _resumo(situacao, inseridas=0, atualizadas=0, inalteradas=0):
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        return ResumoImportacao(nome, situacao, inseridas, atualizadas, inalteradas, duracao_ms)
+
+    if not fonte.arquivo.is_file():
+        return _resumo("ausente")
+
+    hash_atual = hash_arquivo(fonte.arquivo)
+    with conectar() as conn:
+        registro = conn.execute("SELECT hash FROM importacao_csv WHERE arquivo = ?", (nome,)).fetchone()
+        if registro is not None and registro[0] == hash_atual and not forcar:
+            return _resumo("inalterado")
+        existentes = _linhas_existentes(conn, fonte)
+
+    # Primeira importação registrada em um banco já populado: só entram as linhas
+    # ausentes, para não desfazer edições feitas antes deste controle existir
+    somente_novas = registro is None and bool(existentes) and not forcar
+    posicoes = [fonte.colunas.index(coluna) for coluna in fonte.chave]
+    inseridas = atualizadas = inalteradas = 0
+
+    for bloco in pd.read_csv(fonte.arquivo, chunksize=TAMANHO_BLOCO):
+        preparado = fonte.preparar(bloco)
+        df = preparado[list(fonte.colunas)]
+        linhas = {}
+        for linha in df.itertuples(index=False, name=None):
+            valores = tuple(_valor(v) for v in linha)
+            # Chave repetida no CSV: vale a última ocorrência do bloco
+            linhas[_chave_natural(valores[i] for i in posicoes)] = valores
+        inalteradas += len(df) - len(linhas)
+
+        inserir, atualizar = [], []
+        for chave, valores in linhas.items():
+            atual = existentes.get(chave)
+            if atual is None:
+                inserir.append(valores)
+            elif atual[1] == valores or somente_novas:
+                inalteradas += 1
+            else:
+                atualizar.append(valores + (atual[0],))
+                existentes[chave] = (atual[0], valores)
+                atualizadas += 1
+
+        if inserir or atualizar or fonte.relacionar:
+            novas = executar_escrita(_gravar_bloco, fonte, inserir, atualizar, preparado)
+            inseridas += len(inserir)
+            for linha in novas:
+                existentes[_chave_natural(linha[1:][i] for i in posicoes)] = (linha[0], tuple(linha[1:]))
+
+    executar_escrita(_registrar_importacao, nome, hash_atual, inseridas, atualizadas, inalteradas)
+    if inseridas or atualizadas:
+        invalidar_catalogo()
+    return _resumo("importado", inseridas, atualizadas, inalteradas)
+
+
+def importar_catalogo(forcar=False, fontes=None):
+    """
+    Importa os CSVs do catálogo alterados desde a última execução; devolve um resumo por arquivo.
+
+    A réplica do catálogo fica congelada até o último arquivo terminar: as
+    sessões passam do catálogo anterior para o novo de uma só vez.
+    """
+    resumos = []
+    with catalogo_congelado():
+        for fonte in fontes or FONTES:
+            try:
+                resumo = importar_arquivo(fonte, forcar)
+            except (OSError, ValueError, KeyError, *ERROS_BANCO) as e:
+                print(f"[ERRO] Falha ao importar {fonte.arquivo.name}: {e}")
+                resumo = ResumoImportacao(fonte.arquivo.name, "erro", 0, 0, 0, 0.0)
+            if resumo.situacao == "ausente":
+                print(f"[WARN] CSV não encontrado: {fonte.arquivo}")
+            elif resumo.situacao == "importado":
+                print(
+                    f"[OK] {resumo.arquivo}: {resumo.inseridas} inserida(s), "
+                    f"{resumo.atualizadas} atualizada(s), {resumo.inalteradas} inalterada(s)"
+                )
+            resumos.append(resumo)
+    return resumos
+
+
+def formatar_resumo(resumos):
+    """Texto do resumo: uma linha por arquivo."""
+    return "\n".join(
+        f"{r.arquivo:<28} {r.situacao:<10} {r.inseridas:>6} ins {r.atualizadas:>6} atu "
+        f"{r.inalteradas:>6} inalt {r.duracao_ms:>9.1f} ms"
+        for r in resumos
+    )
@@ -0,0 +1,273 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+import db_conexao
+from db_backend import eh_sqlite
+from db_conexao import conectar
+from db_escrita import escrever
+from db_shards import SHARDS_DIR
+
+# === Manutenção do banco ===
+# Backups a quente pela API de backup do SQLite, em passos curtos de páginas
+# com pausas entre eles (o app continua atendendo durante a cópia), além de
+# PRAGMA optimize/ANALYZE, vácuo incremental e checkpoint do WAL. Cada
+# tarefa gera um relatório com a duração e os bytes recuperados, gravado em
+# manutencao_log. O agendador roda em uma thread em segundo plano.
+
+BACKUP_DIR = Path(__file__).resolve().parent / "backups"
+BACKUPS_MANTIDOS = 7                # cópias mantidas por banco (rotação)
+PARCIAL_ABANDONADO_S = 3600         # .parcial sem escrita há mais tempo que isso é de um backup interrompido
+PAGINAS_POR_PASSO = 256             # páginas copiadas por passo do backup
+PAUSA_ENTRE_PASSOS_S = 0.01         # folga entre passos para as demais conexões
+PAGINAS_VACUO_POR_VEZ = 2048        # páginas livres devolvidas por vácuo incremental
+INTERVALO_MANUTENCAO_S = 24 * 3600  # intervalo entre ciclos completos
+INTERVALO_AGENDADOR_S = 60          # frequência com que o agendador confere o histórico
+AGENDADOR_ATIVO = eh_sqlite() and os.environ.get("ELDEN_MANUTENCAO_AUTOMATICA", "1") == "1"
+
+_lock = threading.Lock()  # um ciclo de manutenção por vez no processo
+_thread = None
+
+
+class RelatorioManutencao(NamedTuple):
+    tarefa: str
+    banco: str
+    iniciada_em: str
+    duracao_ms: float
+    bytes_recuperados: int
+    detalhe: str
+
+
+def bancos():
+    """Arquivos de banco mantidos: o principal e os shards de usuário existentes."""
+    return [Path(db_conexao.DB_PATH)] + sorted(SHARDS_DIR.glob("*.db"))
+
+
+def _tamanho(caminho):
+    return sum(
+        os.path.getsize(arquivo)
+        for arquivo in (str(caminho), f"{caminho}-wal")
+        if os.path.exists(arquivo)
+    )
+
+
+def _medir(tarefa, caminho, executar):
+    """Executa a tarefa e monta o relatório (duração e variação de tamanho em disco)."""
+    iniciada_em = datetime.now().isoformat(timespec="seconds")
+    antes = _tamanho(caminho)
+    inicio = time.perf_counter()
+    detalhe = executar()
+    duracao_ms = (time.perf_counter() - inicio) * 1000
+    return RelatorioManutencao(
+        tarefa=tarefa,
+        banco=Path(caminho).name,
+        iniciada_em=iniciada_em,
+        duracao_ms=duracao_ms,
+        bytes_recuperados=max(antes - _tamanho(caminho), 0),
+        detalhe=detalhe,
+    )
+
+
+# === Tarefas ===
+def fazer_backup(caminho=None):
+    """Backup a quente em passos de PAGINAS_POR_PASSO, com rotação das cópias antigas."""
+    caminho = Path(caminho or db_conexao.DB_PATH)
+
+    def _executar():
+        BACKUP_DIR.mkdir(exist_ok=True)
+        carimbo = datetime.now().strftime("%Y%m%d-%H%M%S")
+        destino = BACKUP_DIR / f"{caminho.stem}-{carimbo}.db"
+        parcial = destino.with_suffix(".db.parcial")
+
+        copia = sqlite3.connect(parcial)
+        try:
+            # Entre um passo e outro o lock de leitura é liberado e a thread cede a vez
+            conectar(caminho).backup(
+                copia,
+                pages=PAGINAS_POR_PASSO,
+                progress=lambda *_: time.sleep(PAUSA_ENTRE_PASSOS_S),
+            )
+        except BaseException:
+            copia.close()
+            parcial.unlink(missing_ok=True)
+            raise
+        copia.close()
+        parcial.replace(destino)  # só cópias completas recebem o nome final
+
+        removidos = _rotacionar_backups(caminho.stem)
+        return f"{destino.name} ({destino.stat().st_size} bytes); {removidos} cópia(s) antiga(s) removida(s)"
+
+    return _medir("backup", caminho, _executar)
+
+
+def _rotacionar_backups(stem):
+    # Só o sufixo exato do carimbo: `dados-*.db` também pegaria as cópias de um shard `dados-x`
+    padrao = re.compile(rf"{re.escape(stem)}-\d{{8}}-\d{{6}}\.db")
+    copias = sorted((c for c in BACKUP_DIR.glob(f"{stem}-*.db") if padrao.fullmatch(c.name)), reverse=True)
+    for antiga in copias[BACKUPS_MANTIDOS:]:
+        antiga.unlink()
+
+    # Cópias parciais de backups interrompidos (processo encerrado no meio da cópia)
+    limite = time.time() - PARCIAL_ABANDONADO_S
+    for parcial in BACKUP_DIR.glob(f"{stem}-*.db.parcial"):
+        if padrao.fullmatch(parcial.name.removesuffix(".parcial")) and parcial.stat().st_mtime < limite:
+            parcial.unlink(missing_ok=True)
+    return len(copias[BACKUPS_MANTIDOS:])
+
+
+def otimizar(caminho=None):
+    """PRAGMA optimize seguido de ANALYZE, para manter as estatísticas do planejador."""
+    caminho = Path(caminho or db_conexao.DB_PATH)
+
+    def _executar():
+        conn = conectar(caminho)
+        conn.execute("PRAGMA main.optimize")
+        conn.execute("ANALYZE main")
+        conn.commit()
+        return "optimize + ANALYZE"
+
+    return _medir("otimizar", caminho, _executar)
+
+
+def vacuo_incremental(caminho=None):
+    """Devolve ao sistema as páginas livres do arquivo (vácuo incremental)."""
+    caminho = Path(caminho or db_conexao.DB_PATH)
+
+    def _executar():
+        conn = conectar(caminho)
+        if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != 2:
+            # O modo incremental só passa a valer após um VACUUM completo (feito uma vez)
+            conn.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM main")
+            return "auto_vacuum convertido para INCREMENTAL (VACUUM completo)"
+
+        livres = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+        conn.execute(f"PRAGMA main.incremental_vacuum({PAGINAS_VACUO_POR_VEZ})").fetchall()
+        return f"{min(livres, PAGINAS_VACUO_POR_VEZ)} de {livres} página(s) livre(s) devolvida(s)"
+
+    return _medir("vacuo", caminho, _executar)
+
+
+def checkpoint_wal(caminho=None):
+    """Checkpoint do WAL com TRUNCATE: aplica o log ao banco e zera o arquivo -wal."""
+    caminho = Path(caminho or db_conexao.DB_PATH)
+
+    def _executar():
+        ocupado, paginas_log, paginas_aplicadas = conectar(caminho).execute(
+            "PRAGMA main.wal_checkpoint(TRUNCATE)"
+        ).fetchone()
+        situacao = "parcial (leitores ativos)" if ocupado else "completo"
+        return f"{paginas_aplicadas}/{paginas_log} página(s) do WAL aplicada(s); {situacao}"
+
+    return _medir("checkpoint", caminho, _executar)
+
+
+TAREFAS = [fazer_backup, otimizar, vacuo_incremental, checkpoint_wal]
+TAREFA_CICLO = "ciclo"  # marcador em manutencao_log de um ciclo completo (todas as TAREFAS)
+
+
+# === Ciclo completo e histórico ===
+def registrar_relatorio(relatorio):
+    escrever("""
+        INSERT INTO manutencao_log (tarefa, banco, iniciada_em, duracao_ms, bytes_recuperados, detalhe)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, tuple(relatorio))
+
+
+def executar_manutencao(tarefas=None):
+    """
+    Executa as tarefas em todos os bancos, registra e devolve os relatórios.
+
+    Um ciclo completo (todas as TAREFAS) termina com uma linha `ciclo` em
+    manutencao_log; só ela conta para o agendador. Tarefas avulsas da linha
+    de comando não adiam o próximo ciclo.
+    """
+    if not eh_sqlite():
+        print("[WARN] Manutenção disponível apenas para o backend SQLite.")
+        return []
+
+    ciclo_completo = tarefas is None or list(tarefas) == TAREFAS
+    iniciado_em = datetime.now().isoformat(timespec="seconds")
+    inicio = time.perf_counter()
+    relatorios = []
+    with _lock:
+        for caminho in bancos():
+            for tarefa in tarefas or TAREFAS:
+                try:
+                    relatorio = tarefa(caminho)
+                except (sqlite3.Error, OSError) as e:
+                    relatorio = RelatorioManutencao(
+                        tarefa.__name__, Path(caminho).name,
+                        datetime.now().isoformat(timespec="seconds"), 0.0, 0, f"[ERRO] {e}"
+                    )
+                registrar_relatorio(relatorio)
+                relatorios.append(relatorio)
+        if ciclo_completo:
+            erros = sum(1 for r in relatorios if r.detalhe.startswith("[ERRO]"))
+            registrar_relatorio(RelatorioManutencao(
+                TAREFA_CICLO, Path(db_conexao.DB_PATH).name, iniciado_em,
+                (time.perf_counter() - inicio) * 1000, sum(r.bytes_recuperados for r in relatorios),
+                f"{len(relatorios)} tarefa(s), {erros} com erro",
+            ))
+    return relatorios
+
+
+def formatar_relatorio(relatorios):
+    """Texto do relatório: uma linha por tarefa e o total recuperado."""
+    linhas = [
+        f"{r.banco:<28} {r.tarefa:<11} {r.duracao_ms:>9.1f} ms {r.bytes_recuperados:>12} bytes  {r.detalhe}"
+        for r in relatorios
+    ]
+    total = sum(r.bytes_recuperados for r in relatorios)
+    linhas.append(f"Total recuperado: {total} bytes")
+    return "\n".join(linhas)
+
+
+def ultima_manutencao():
+    """Início do último ciclo completo registrado (datetime) ou None."""
+    with conectar() as conn:
+        ultima = conn.execute(
+            "SELECT MAX(iniciada_em) FROM manutencao_log WHERE tarefa = ?", (TAREFA_CICLO,)
+        ).fetchone()[0]
+    return datetime.fromisoformat(ultima) if ultima else None
+
+
+def historico_manutencao(limite=20):
+    """Últimas tarefas registradas em manutencao_log, da mais recente para a mais antiga."""
+    with conectar() as conn:
+        return pd.read_sql_query("""
+            SELECT iniciada_em, banco, tarefa, ROUND(duracao_ms, 1) AS duracao_ms, bytes_recuperados, detalhe
+            FROM manutencao_log
+            ORDER BY id DESC
+            LIMIT ?
+        """, conn, params=(limite,))
+
+
+# === Agendador ===
+def _laco_agendador():
+    while True:
+        try:
+            ultima = ultima_manutencao()
+            if ultima is None or (datetime.now() - ultima).total_seconds() >= INTERVALO_MANUTENCAO_S:
+                print(formatar_relatorio(executar_manutencao()))
+        except Exception as e:
+            print(f"[ERRO] Falha na manutenção agendada: {e}")
+        time.sleep(INTERVALO_AGENDADOR_S)
+
+
+def iniciar_agendador():
+    """Inicia (uma vez por processo) a thread que roda a manutenção no intervalo configurado."""
+    global _thread
+    if not AGENDADOR_ATIVO:
+        return
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_laco_agendador, name="manutencao-sqlite", daemon=True)
+            _thread.start()
@@ -0,0 +1,127 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+# === Registro de tempo das consultas ===
+# As conexões SQLite do pool usam ConexaoMedida: cada SELECT/INSERT/UPDATE/
+# DELETE tem o tempo de execução (e o das leituras de resultado) somado por
+# texto de SQL, para a página de administração listar as consultas mais lentas.
+
+MEDIR_CONSULTAS = os.environ.get("ELDEN_MEDIR_CONSULTAS", "1") == "1"
+MAX_CONSULTAS = 500  # textos de SQL distintos mantidos no registro
+
+_COMANDOS_MEDIDOS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+_lock = threading.Lock()
+_consultas = {}  # sql normalizado -> [execuções, total_ms, maior_ms]
+
+
+class ConsultaRegistrada(NamedTuple):
+    sql: str
+    execucoes: int
+    total_ms: float
+    media_ms: float
+    maior_ms: float
+
+
+def _normalizar(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def _registrar(sql, duracao_ms, execucao_ms, nova_execucao):
+    chave = _normalizar(sql)
+    if not chave.upper().startswith(_COMANDOS_MEDIDOS):
+        return
+    with _lock:
+        item = _consultas.get(chave)
+        if item is None:
+            if len(_consultas) >= MAX_CONSULTAS:
+                return
+            item = _consultas[chave] = [0, 0.0, 0.0]
+        if nova_execucao:
+            item[0] += 1
+        item[1] += duracao_ms
+        item[2] = max(item[2], execucao_ms)
+
+
+class CursorMedido(sqlite3.Cursor):
+    """Cursor que soma ao registro o tempo de execute/executemany e de fetch*."""
+
+    _sql = None
+    _execucao_ms = 0.0
+
+    def _medir(self, metodo, sql, *args):
+        inicio = time.perf_counter()
+        try:
+            return metodo(sql, *args)
+        finally:
+            self._sql = sql
+            self._execucao_ms = (time.perf_counter() - inicio) * 1000
+            _registrar(sql, self._execucao_ms, self._execucao_ms, nova_execucao=True)
+
+    def execute(self, sql, parametros=()):
+        return self._medir(super().execute, sql, parametros)
+
+    def executemany(self, sql, lista_parametros):
+        return self._medir(super().executemany, sql, lista_parametros)
+
+    def _ler(self, metodo, *args):
+        inicio = time.perf_counter()
+        try:
+            return metodo(*args)
+        finally:
+            if self._sql is not None:
+                decorrido = (time.perf_counter() - inicio) * 1000
+                self._execucao_ms += decorrido
+                _registrar(self._sql, decorrido, self._execucao_ms, nova_execucao=False)
+
+    def fetchone(self):
+        return self._ler(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._ler(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._ler(super().fetchall)
+
+
+class ConexaoMedida(sqlite3.Connection):
+    """sqlite3.Connection cujos cursores (inclusive os do pandas) são CursorMedido."""
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or CursorMedido)
+
+    def execute(self, sql, parametros=()):
+        return self.cursor().execute(sql, parametros)
+
+    def executemany(self, sql, lista_parametros):
+        return self.cursor().executemany(sql, lista_parametros)
+
+
+def fabrica_conexao():
+    """Classe de conexão para `sqlite3.connect(factory=...)`, conforme MEDIR_CONSULTAS."""
+    return ConexaoMedida if MEDIR_CONSULTAS else sqlite3.Connection
+
+
+# === Leitura do registro ===
+def consultas_registradas():
+    """Todas as consultas registradas no processo, sem ordem definida."""
+    with _lock:
+        itens = [(sql, *valores) for sql, valores in _consultas.items()]
+    return [
+        ConsultaRegistrada(sql, execucoes, total_ms, total_ms / execucoes if execucoes else 0.0, maior_ms)
+        for sql, execucoes, total_ms, maior_ms in itens
+    ]
+
+
+def consultas_mais_lentas(limite=20):
+    """As consultas com maior tempo médio por execução."""
+    return sorted(consultas_registradas(), key=lambda c: c.media_ms, reverse=True)[:limite]
+
+
+def limpar_registro():
+    with _lock:
+        _consultas.clear()
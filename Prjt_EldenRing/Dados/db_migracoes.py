@@ -0,0 +1,840 @@
+import threading
+
+from db_backend import ID_AUTOINCREMENTO, atualizar_estatisticas, colunas as _colunas, eh_sqlite, iniciar_escrita
+from db_conexao import conectar
+from repositorios.bosses import sincronizar_loot
+
+# === Controle de versão do esquema ===
+# Cada migração é aplicada uma única vez, em ordem, dentro de sua própria
+# transação; a versão aplicada fica registrada na tabela schema_version.
+#
+# Uma migração tem até duas partes:
+#   - principal: tabelas que só existem no banco principal (usuários e catálogo)
+#   - usuario:   tabelas de dados mutáveis por usuário (personagens, jornada,
+#                builds). Rodam no banco principal e também em cada shard.
+
+_lock = threading.Lock()
+_bancos_atualizados = set()
+
+
+# === Migrações ===
+def _m001_esquema_base_principal(conn):
+    """Tabelas originais de usuários e catálogo (antes criadas por cada criar_tabela_*)."""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS user_jogador (
+            id {ID_AUTOINCREMENTO},
+            nome_completo TEXT NOT NULL,
+            nome_usuario TEXT NOT NULL UNIQUE,
+            senha TEXT NOT NULL,
+            permissao TEXT NOT NULL DEFAULT 'USER'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS bosses (
+            id {ID_AUTOINCREMENTO},
+            nome TEXT,
+            localidade TEXT,
+            location TEXT,
+            runes INTEGER,
+            loot TEXT,
+            stance TEXT,
+            tipo_dano_pref TEXT,
+            resistencia TEXT
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS boss_levels (
+            id {ID_AUTOINCREMENTO},
+            localidade TEXT,
+            nome TEXT,
+            level TEXT
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS weapons (
+            id {ID_AUTOINCREMENTO},
+            type TEXT,
+            name TEXT,
+            vigor INTEGER,
+            mind INTEGER,
+            vitality INTEGER,
+            strength INTEGER,
+            dexterity INTEGER,
+            intelligence INTEGER,
+            faith INTEGER,
+            arcane INTEGER
+        )
+    """)
+
+
+def _m001_esquema_base_usuario(conn):
+    """Tabelas originais de personagens, jornada e builds."""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS jogadores_personagens (
+            id {ID_AUTOINCREMENTO},
+            nome_jogador TEXT NOT NULL,
+            nome_personagem TEXT NOT NULL,
+            nome_usuario_criador TEXT NOT NULL
+        )
+    """)
+    # Bancos antigos foram criados sem a coluna nome_usuario_criador
+    if "nome_usuario_criador" not in _colunas(conn, "jogadores_personagens"):
+        conn.execute("ALTER TABLE jogadores_personagens ADD COLUMN nome_usuario_criador TEXT")
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS jornada (
+            id {ID_AUTOINCREMENTO},
+            personagem TEXT,
+            nome TEXT,
+            localidade TEXT,
+            location TEXT,
+            runes INTEGER,
+            loot TEXT,
+            stance TEXT,
+            tipo_dano_pref TEXT,
+            resistencia TEXT,
+            level TEXT,
+            status_boss TEXT
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS build (
+            id {ID_AUTOINCREMENTO},
+            personagem TEXT UNIQUE,
+            vigor INTEGER DEFAULT 0,
+            mind INTEGER DEFAULT 0,
+            endurance INTEGER DEFAULT 0,
+            strength INTEGER DEFAULT 0,
+            dexterity INTEGER DEFAULT 0,
+            intelligence INTEGER DEFAULT 0,
+            faith INTEGER DEFAULT 0,
+            arcane INTEGER DEFAULT 0
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS build_weapon (
+            personagem TEXT NOT NULL,
+            status TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            item TEXT,
+            valor INTEGER,
+            PRIMARY KEY (personagem, status, slot)
+        )
+    """)
+
+
+def _m002_indices_consultas_principal(conn):
+    """Índice de expressão usado pelos joins da página de Jornada."""
+    # Os joins usam LOWER(TRIM(...)); o índice de expressão precisa da mesma forma
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_boss_levels_localidade_nome
+        ON boss_levels (LOWER(TRIM(localidade)), LOWER(TRIM(nome)))
+    """)
+    atualizar_estatisticas(conn)
+
+
+def _m002_indices_consultas_usuario(conn):
+    """Índices para as consultas mais frequentes das páginas."""
+    # Jornada: filtros por personagem + status e por personagem + localidade
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jornada_personagem_status ON jornada (personagem, status_boss)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jornada_personagem_localidade ON jornada (personagem, localidade)")
+    # Personagens listados por usuário em todas as páginas
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jogadores_usuario ON jogadores_personagens (nome_usuario_criador)")
+    # build_weapon já é coberta pela chave primária (personagem, status, slot)
+    atualizar_estatisticas(conn)
+
+
+def _m003_versao_catalogo_principal(conn):
+    """Contador de alterações do catálogo, usado para renovar a réplica em memória."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS catalogo_versao (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            versao INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT INTO catalogo_versao (id, versao) VALUES (1, 0) ON CONFLICT(id) DO NOTHING")
+
+    # A réplica em memória só existe no SQLite; os gatilhos usam a sintaxe dele
+    if not eh_sqlite():
+        return
+    for tabela in ("bosses", "boss_levels", "weapons"):
+        _criar_gatilhos_catalogo(conn, tabela)
+
+
+def _criar_gatilhos_catalogo(conn, tabela):
+    """Gatilhos que incrementam catalogo_versao a cada escrita na tabela do catálogo (só SQLite)."""
+    for evento in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_catalogo_{tabela}_{evento.lower()}
+            AFTER {evento} ON {tabela}
+            BEGIN
+                UPDATE catalogo_versao SET versao = versao + 1 WHERE id = 1;
+            END
+        """)
+
+
+def _m004_log_manutencao_principal(conn):
+    """Histórico das tarefas de manutenção (backup, optimize, vácuo, checkpoint)."""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS manutencao_log (
+            id {ID_AUTOINCREMENTO},
+            tarefa TEXT NOT NULL,
+            banco TEXT NOT NULL,
+            iniciada_em TEXT NOT NULL,
+            duracao_ms REAL NOT NULL,
+            bytes_recuperados INTEGER NOT NULL DEFAULT 0,
+            detalhe TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_manutencao_log_tarefa ON manutencao_log (tarefa, iniciada_em)")
+
+
+def _m005_chave_personagem_usuario(conn):
+    """Troca o nome do personagem pela chave inteira jogadores_personagens.id."""
+    # Nomes sem personagem cadastrado ganham um cadastro sem dono, para não perder dados
+    conn.execute("""
+        INSERT INTO jogadores_personagens (nome_jogador, nome_personagem, nome_usuario_criador)
+        SELECT nome, nome, '' FROM (
+            SELECT personagem AS nome FROM jornada
+            UNION SELECT personagem FROM build
+            UNION SELECT personagem FROM build_weapon
+        ) AS orfaos
+        WHERE nome IS NOT NULL
+          AND nome NOT IN (SELECT nome_personagem FROM jogadores_personagens)
+    """)
+
+    # Cada tabela é recriada com personagem_id; nomes repetidos entre usuários viram cópias por personagem
+    conn.execute(f"""
+        CREATE TABLE jornada_nova (
+            id {ID_AUTOINCREMENTO},
+            personagem_id INTEGER NOT NULL,
+            nome TEXT,
+            localidade TEXT,
+            location TEXT,
+            runes INTEGER,
+            loot TEXT,
+            stance TEXT,
+            tipo_dano_pref TEXT,
+            resistencia TEXT,
+            level TEXT,
+            status_boss TEXT
+        )
+    """)
+    conn.execute("""
+        INSERT INTO jornada_nova (
+            personagem_id, nome, localidade, location, runes, loot,
+            stance, tipo_dano_pref, resistencia, level, status_boss
+        )
+        SELECT p.id, j.nome, j.localidade, j.location, j.runes, j.loot,
+               j.stance, j.tipo_dano_pref, j.resistencia, j.level, j.status_boss
+        FROM jornada j
+        JOIN jogadores_personagens p ON p.nome_personagem = j.personagem
+        ORDER BY p.id, j.id
+    """)
+    conn.execute("DROP TABLE jornada")
+    conn.execute("ALTER TABLE jornada_nova RENAME TO jornada")
+    conn.execute("CREATE INDEX idx_jornada_personagem_status ON jornada (personagem_id, status_boss)")
+    conn.execute("CREATE INDEX idx_jornada_personagem_localidade ON jornada (personagem_id, localidade)")
+
+    conn.execute(f"""
+        CREATE TABLE build_nova (
+            id {ID_AUTOINCREMENTO},
+            personagem_id INTEGER NOT NULL UNIQUE,
+            vigor INTEGER DEFAULT 0,
+            mind INTEGER DEFAULT 0,
+            endurance INTEGER DEFAULT 0,
+            strength INTEGER DEFAULT 0,
+            dexterity INTEGER DEFAULT 0,
+            intelligence INTEGER DEFAULT 0,
+            faith INTEGER DEFAULT 0,
+            arcane INTEGER DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        INSERT INTO build_nova (
+            personagem_id, vigor, mind, endurance, strength,
+            dexterity, intelligence, faith, arcane
+        )
+        SELECT p.id, b.vigor, b.mind, b.endurance, b.strength,
+               b.dexterity, b.intelligence, b.faith, b.arcane
+        FROM build b
+        JOIN jogadores_personagens p ON p.nome_personagem = b.personagem
+        ORDER BY p.id
+    """)
+    conn.execute("DROP TABLE build")
+    conn.execute("ALTER TABLE build_nova RENAME TO build")
+
+    conn.execute("""
+        CREATE TABLE build_weapon_nova (
+            personagem_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            item TEXT,
+            valor INTEGER,
+            PRIMARY KEY (personagem_id, status, slot)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO build_weapon_nova (personagem_id, status, slot, item, valor)
+        SELECT p.id, w.status, w.slot, w.item, w.valor
+        FROM build_weapon w
+        JOIN jogadores_personagens p ON p.nome_personagem = w.personagem
+    """)
+    conn.execute("DROP TABLE build_weapon")
+    conn.execute("ALTER TABLE build_weapon_nova RENAME TO build_weapon")
+    atualizar_estatisticas(conn)
+
+
+def _m006_jornada_normalizada_usuario(conn):
+    """Jornada passa a guardar só (personagem, boss, status, morto_em); o resto vem do catálogo."""
+    conn.execute(f"""
+        CREATE TABLE jornada_nova (
+            id {ID_AUTOINCREMENTO},
+            personagem_id INTEGER NOT NULL,
+            boss_id INTEGER NOT NULL,
+            status_boss TEXT NOT NULL DEFAULT 'Vivo',
+            morto_em TEXT,
+            UNIQUE (personagem_id, boss_id)
+        )
+    """)
+    # Cópias antigas são ligadas ao boss pelo par localidade + nome; 'Morto' prevalece em duplicatas
+    conn.execute("""
+        INSERT INTO jornada_nova (id, personagem_id, boss_id, status_boss)
+        SELECT MIN(j.id), j.personagem_id, b.id, MIN(COALESCE(j.status_boss, 'Vivo'))
+        FROM jornada j
+        JOIN bosses b
+            ON LOWER(TRIM(b.localidade)) = LOWER(TRIM(j.localidade))
+           AND LOWER(TRIM(b.nome)) = LOWER(TRIM(j.nome))
+        GROUP BY j.personagem_id, b.id
+    """)
+    conn.execute("DROP TABLE jornada")
+    conn.execute("ALTER TABLE jornada_nova RENAME TO jornada")
+    # (personagem_id, boss_id) já é coberto pela restrição UNIQUE
+    conn.execute("CREATE INDEX idx_jornada_personagem_status ON jornada (personagem_id, status_boss)")
+    atualizar_estatisticas(conn)
+
+
+def _m007_visao_jornada_principal(conn):
+    """Visão da jornada com os dados do boss e o level, para leituras."""
+    conn.execute("""
+        CREATE VIEW jornada_detalhada AS
+        SELECT j.id, j.personagem_id, j.boss_id,
+               b.nome, b.localidade, b.location, b.runes, b.loot, b.stance,
+               b.tipo_dano_pref, b.resistencia, bl.level,
+               j.status_boss, j.morto_em
+        FROM jornada j
+        JOIN bosses b ON b.id = j.boss_id
+        LEFT JOIN boss_levels bl
+            ON LOWER(TRIM(bl.localidade)) = LOWER(TRIM(b.localidade))
+           AND LOWER(TRIM(bl.nome)) = LOWER(TRIM(b.nome))
+    """)
+
+
+
+# Identidade normalizada do boss (localidade + nome), a mesma em bosses e boss_levels
+_EXPRESSAO_CHAVE_BOSS = "LOWER(TRIM(localidade)) || '|' || LOWER(TRIM(nome))"
+
+
+def _m008_chave_boss_principal(conn):
+    """Coluna gerada `chave` indexada em bosses e boss_levels; a visão passa a juntar por ela."""
+    # No SQLite a coluna é VIRTUAL (ADD COLUMN não aceita STORED) e o valor fica
+    # gravado no índice; no PostgreSQL colunas geradas são sempre STORED
+    armazenamento = "VIRTUAL" if eh_sqlite() else "STORED"
+
+    # A visão depende das tabelas alteradas: é recriada com o novo join
+    conn.execute("DROP VIEW IF EXISTS jornada_detalhada")
+    for tabela in ("bosses", "boss_levels"):
+        conn.execute(f"""
+            ALTER TABLE {tabela}
+            ADD COLUMN chave TEXT GENERATED ALWAYS AS ({_EXPRESSAO_CHAVE_BOSS}) {armazenamento}
+        """)
+        conn.execute(f"CREATE INDEX idx_{tabela}_chave ON {tabela} (chave)")
+
+    conn.execute("""
+        CREATE VIEW jornada_detalhada AS
+        SELECT j.id, j.personagem_id, j.boss_id,
+               b.nome, b.localidade, b.location, b.runes, b.loot, b.stance,
+               b.tipo_dano_pref, b.resistencia, bl.level,
+               j.status_boss, j.morto_em
+        FROM jornada j
+        JOIN bosses b ON b.id = j.boss_id
+        LEFT JOIN boss_levels bl ON bl.chave = b.chave
+    """)
+    atualizar_estatisticas(conn)
+
+
+def _m009_colunas_numericas_principal(conn):
+    """Faixa de level (ordem, mínimo, máximo) e valor da stance como inteiros, para ordenar e filtrar em SQL."""
+    # Os valores são calculados na importação (repositorios.bosses); linhas
+    # existentes são preenchidas por completar_campos_numericos na inicialização
+    conn.execute("DROP VIEW IF EXISTS jornada_detalhada")
+    for coluna in ("level_ord", "level_min", "level_max"):
+        conn.execute(f"ALTER TABLE boss_levels ADD COLUMN {coluna} INTEGER")
+    conn.execute("ALTER TABLE bosses ADD COLUMN stance_valor INTEGER")
+    conn.execute("CREATE INDEX idx_boss_levels_level_ord ON boss_levels (level_ord)")
+
+    conn.execute("""
+        CREATE VIEW jornada_detalhada AS
+        SELECT j.id, j.personagem_id, j.boss_id,
+               b.nome, b.localidade, b.location, b.runes, b.loot, b.stance,
+               b.tipo_dano_pref, b.resistencia, bl.level,
+               bl.level_ord, bl.level_min, bl.level_max,
+               j.status_boss, j.morto_em
+        FROM jornada j
+        JOIN bosses b ON b.id = j.boss_id
+        LEFT JOIN boss_levels bl ON bl.chave = b.chave
+    """)
+
+
+def _m010_chaves_estrangeiras_usuario(conn):
+    """Recria jornada, build e build_weapon com FOREIGN KEY para o personagem e ON DELETE CASCADE."""
+    # A visão depende de jornada; volta na migração 011 (só no banco principal).
+    # Qualificada no SQLite: em shards, o nome sem esquema acharia a visão do
+    # catálogo anexado. No PostgreSQL não há `main` (nem shards)
+    conn.execute(f"DROP VIEW IF EXISTS {'main.' if eh_sqlite() else ''}jornada_detalhada")
+
+    # Só as linhas de personagens existentes são copiadas: a cópia já é a limpeza dos órfãos
+    conn.execute(f"""
+        CREATE TABLE jornada_nova (
+            id {ID_AUTOINCREMENTO},
+            personagem_id INTEGER NOT NULL REFERENCES jogadores_personagens (id) ON DELETE CASCADE,
+            boss_id INTEGER NOT NULL,
+            status_boss TEXT NOT NULL DEFAULT 'Vivo',
+            morto_em TEXT,
+            UNIQUE (personagem_id, boss_id)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO jornada_nova (id, personagem_id, boss_id, status_boss, morto_em)
+        SELECT id, personagem_id, boss_id, status_boss, morto_em
+        FROM jornada
+        WHERE personagem_id IN (SELECT id FROM jogadores_personagens)
+    """)
+    conn.execute("DROP TABLE jornada")
+    conn.execute("ALTER TABLE jornada_nova RENAME TO jornada")
+    conn.execute("CREATE INDEX idx_jornada_personagem_status ON jornada (personagem_id, status_boss)")
+
+    conn.execute(f"""
+        CREATE TABLE build_nova (
+            id {ID_AUTOINCREMENTO},
+            personagem_id INTEGER NOT NULL UNIQUE REFERENCES jogadores_personagens (id) ON DELETE CASCADE,
+            vigor INTEGER DEFAULT 0,
+            mind INTEGER DEFAULT 0,
+            endurance INTEGER DEFAULT 0,
+            strength INTEGER DEFAULT 0,
+            dexterity INTEGER DEFAULT 0,
+            intelligence INTEGER DEFAULT 0,
+            faith INTEGER DEFAULT 0,
+            arcane INTEGER DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        INSERT INTO build_nova (
+            id, personagem_id, vigor, mind, endurance, strength,
+            dexterity, intelligence, faith, arcane
+        )
+        SELECT id, personagem_id, vigor, mind, endurance, strength,
+               dexterity, intelligence, faith, arcane
+        FROM build
+        WHERE personagem_id IN (SELECT id FROM jogadores_personagens)
+    """)
+    conn.execute("DROP TABLE build")
+    conn.execute("ALTER TABLE build_nova RENAME TO build")
+
+    conn.execute("""
+        CREATE TABLE build_weapon_nova (
+            personagem_id INTEGER NOT NULL REFERENCES jogadores_personagens (id) ON DELETE CASCADE,
+            status TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            item TEXT,
+            valor INTEGER,
+            PRIMARY KEY (personagem_id, status, slot)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO build_weapon_nova (personagem_id, status, slot, item, valor)
+        SELECT personagem_id, status, slot, item, valor
+        FROM build_weapon
+        WHERE personagem_id IN (SELECT id FROM jogadores_personagens)
+    """)
+    conn.execute("DROP TABLE build_weapon")
+    conn.execute("ALTER TABLE build_weapon_nova RENAME TO build_weapon")
+    atualizar_estatisticas(conn)
+
+
+def _m011_visao_jornada_principal(conn):
+    """Recria jornada_detalhada após a reconstrução da jornada (migração 010)."""
+    conn.execute("""
+        CREATE VIEW jornada_detalhada AS
+        SELECT j.id, j.personagem_id, j.boss_id,
+               b.nome, b.localidade, b.location, b.runes, b.loot, b.stance,
+               b.tipo_dano_pref, b.resistencia, bl.level,
+               bl.level_ord, bl.level_min, bl.level_max,
+               j.status_boss, j.morto_em
+        FROM jornada j
+        JOIN bosses b ON b.id = j.boss_id
+        LEFT JOIN boss_levels bl ON bl.chave = b.chave
+    """)
+
+
+# Escopos de data_version: (tabela, escopo, coluna que identifica o usuário/personagem)
+_VERSOES_CATALOGO = [("bosses", "bosses", None), ("boss_levels", "boss_levels", None), ("weapons", "weapons", None)]
+_VERSOES_USUARIO = [
+    ("jogadores_personagens", "personagens", "nome_usuario_criador"),
+    ("jornada", "jornada", "personagem_id"),
+    ("build", "build", "personagem_id"),
+    ("build_weapon", "build", "personagem_id"),
+]
+
+
+def _criar_tabela_versoes(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            escopo TEXT NOT NULL,
+            chave TEXT NOT NULL DEFAULT '',
+            versao INTEGER NOT NULL,
+            PRIMARY KEY (escopo, chave)
+        )
+    """)
+
+
+def _criar_gatilhos_versao(conn, tabela, escopo, coluna=None):
+    """
+    Gatilhos que incrementam data_version a cada INSERT/UPDATE/DELETE em `tabela`.
+
+    Sempre sobe a versão da tabela inteira (chave ''); com `coluna`, também a
+    do usuário/personagem da linha (em UPDATE, o antigo e o novo, se mudou).
+    Reconstruir a tabela apaga os gatilhos: chamar de novo na migração.
+    """
+    incremento = "ON CONFLICT (escopo, chave) DO UPDATE SET versao = data_version.versao + 1"
+    for evento in ("INSERT", "UPDATE", "DELETE"):
+        linha = "OLD" if evento == "DELETE" else "NEW"
+        valores = f"('{escopo}', '', 1)"
+        if coluna:
+            valores += f", ('{escopo}', CAST({linha}.{coluna} AS TEXT), 1)"
+        corpo = f"INSERT INTO data_version (escopo, chave, versao) VALUES {valores} {incremento};"
+        if coluna and evento == "UPDATE":
+            corpo += f"""
+                INSERT INTO data_version (escopo, chave, versao)
+                SELECT '{escopo}', CAST(OLD.{coluna} AS TEXT), 1
+                WHERE OLD.{coluna} IS NOT NEW.{coluna}
+                {incremento};"""
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_versao_{tabela}_{evento.lower()}
+            AFTER {evento} ON {tabela}
+            BEGIN
+                {corpo}
+            END
+        """)
+
+
+def _m012_versoes_principal(conn):
+    """Contadores de alteração do catálogo em data_version (por tabela)."""
+    _criar_tabela_versoes(conn)
+    # Como em catalogo_versao, os gatilhos usam a sintaxe do SQLite
+    if not eh_sqlite():
+        return
+    for tabela, escopo, coluna in _VERSOES_CATALOGO:
+        _criar_gatilhos_versao(conn, tabela, escopo, coluna)
+
+
+def _m012_versoes_usuario(conn):
+    """Contadores de alteração de personagens (por usuário), jornada e builds (por personagem)."""
+    _criar_tabela_versoes(conn)
+    if not eh_sqlite():
+        return
+    for tabela, escopo, coluna in _VERSOES_USUARIO:
+        _criar_gatilhos_versao(conn, tabela, escopo, coluna)
+
+
+def _m013_importacao_csv_principal(conn):
+    """Hash e resumo da última importação de cada CSV do catálogo."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS importacao_csv (
+            arquivo TEXT PRIMARY KEY,
+            hash TEXT NOT NULL,
+            importado_em TEXT NOT NULL,
+            inseridas INTEGER NOT NULL DEFAULT 0,
+            atualizadas INTEGER NOT NULL DEFAULT 0,
+            inalteradas INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def _m014_weapons_unicas_principal(conn):
+    """Uma linha por arma (nome UNIQUE, requisitos inteiros) e os tipos em weapon_tipos."""
+    atributos = ["vigor", "mind", "vitality", "strength", "dexterity", "intelligence", "faith", "arcane"]
+    conn.execute(f"""
+        CREATE TABLE weapons_nova (
+            id {ID_AUTOINCREMENTO},
+            name TEXT NOT NULL UNIQUE,
+            {", ".join(f"{a} INTEGER NOT NULL DEFAULT 0" for a in atributos)}
+        )
+    """)
+    # Nomes repetidos (mesma arma listada em vários tipos) ficam com a última linha, como na importação
+    conn.execute(f"""
+        INSERT INTO weapons_nova (id, name, {", ".join(atributos)})
+        SELECT w.id, TRIM(w.name), {", ".join(f"COALESCE(w.{a}, 0)" for a in atributos)}
+        FROM weapons w
+        WHERE w.id = (SELECT MAX(w2.id) FROM weapons w2 WHERE TRIM(w2.name) = TRIM(w.name))
+    """)
+    # A tabela antiga sai do caminho antes de weapon_tipos existir: com
+    # foreign_keys=ON, um DROP de weapons já referenciada esvaziaria weapon_tipos
+    conn.execute("ALTER TABLE weapons RENAME TO weapons_antiga")
+    conn.execute("ALTER TABLE weapons_nova RENAME TO weapons")
+    conn.execute("""
+        CREATE TABLE weapon_tipos (
+            weapon_id INTEGER NOT NULL REFERENCES weapons (id) ON DELETE CASCADE,
+            tipo TEXT NOT NULL,
+            PRIMARY KEY (weapon_id, tipo)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO weapon_tipos (weapon_id, tipo)
+        SELECT DISTINCT n.id, TRIM(w.type)
+        FROM weapons_antiga w
+        JOIN weapons n ON n.name = TRIM(w.name)
+        WHERE w.type IS NOT NULL
+    """)
+    conn.execute("DROP TABLE weapons_antiga")
+    # Sem tipos aproveitáveis na tabela antiga, o hash registrado do CSV de armas
+    # sai de importacao_csv: a próxima importação relê o CSV e grava os tipos
+    conn.execute("""
+        DELETE FROM importacao_csv
+        WHERE arquivo = 'elden_ring_weapon.csv' AND NOT EXISTS (SELECT 1 FROM weapon_tipos)
+    """)
+    # Filtro da página de Build por tipo
+    conn.execute("CREATE INDEX idx_weapon_tipos_tipo ON weapon_tipos (tipo, weapon_id)")
+
+    # Os gatilhos de weapons foram descartados com a tabela antiga (migrações 003 e 012)
+    if eh_sqlite():
+        for tabela in ("weapons", "weapon_tipos"):
+            _criar_gatilhos_catalogo(conn, tabela)
+            _criar_gatilhos_versao(conn, tabela, "weapons")
+    atualizar_estatisticas(conn)
+
+def _m015_boss_loot_principal(conn):
+    """Loot de cada boss em linhas de boss_loot (item e quantidade), indexado pelo item."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS boss_loot (
+            boss_id INTEGER NOT NULL REFERENCES bosses (id) ON DELETE CASCADE,
+            item TEXT NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (boss_id, item)
+        )
+    """)
+    # "Quais bosses dropam X": busca pelo item sem ler a tabela bosses
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_boss_loot_item ON boss_loot (item, boss_id)")
+
+    if eh_sqlite():
+        _criar_gatilhos_catalogo(conn, "boss_loot")
+        _criar_gatilhos_versao(conn, "boss_loot", "bosses")
+
+    sincronizar_loot(conn)
+    atualizar_estatisticas(conn)
+
+def _m016_mascaras_dano_principal(conn):
+    """Fraquezas e resistências dos bosses como máscaras de bits do vocabulário de tipos de dano."""
+    # Calculadas na importação (repositorios.bosses.TIPOS_DANO); linhas
+    # existentes são preenchidas por completar_campos_numericos na inicialização
+    conn.execute("DROP VIEW IF EXISTS jornada_detalhada")
+    conn.execute("ALTER TABLE bosses ADD COLUMN fraquezas INTEGER")
+    conn.execute("ALTER TABLE bosses ADD COLUMN resistencias INTEGER")
+
+    conn.execute("""
+        CREATE VIEW jornada_detalhada AS
+        SELECT j.id, j.personagem_id, j.boss_id,
+               b.nome, b.localidade, b.location, b.runes, b.loot, b.stance,
+               b.tipo_dano_pref, b.resistencia, b.fraquezas, b.resistencias, bl.level,
+               bl.level_ord, bl.level_min, bl.level_max,
+               j.status_boss, j.morto_em
+        FROM jornada j
+        JOIN bosses b ON b.id = j.boss_id
+        LEFT JOIN boss_levels bl ON bl.chave = b.chave
+    """)
+
+def _m017_pacotes_principal(conn):
+    """Pacotes de conteúdo do catálogo (jogo base, DLC, comunidade) e o pacote de cada boss."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pacotes (
+            codigo TEXT PRIMARY KEY,
+            nome TEXT NOT NULL,
+            descricao TEXT,
+            padrao INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.executemany("""
+        INSERT INTO pacotes (codigo, nome, descricao, padrao) VALUES (?, ?, ?, ?)
+        ON CONFLICT (codigo) DO NOTHING
+    """, [
+        ("base", "Jogo base", "Bosses do Elden Ring original", 1),
+        ("dlc", "Shadow of the Erdtree", "Bosses da expansão", 0),
+        ("comunidade", "Adições da comunidade", "Bosses cadastrados fora dos CSVs oficiais", 0),
+    ])
+    # Bosses já cadastrados são do jogo base; a coluna Pacote do CSV define os demais
+    conn.execute("ALTER TABLE bosses ADD COLUMN pacote TEXT NOT NULL DEFAULT 'base'")
+    # Jornada: bosses dos pacotes ativos do personagem
+    conn.execute("CREATE INDEX idx_bosses_pacote ON bosses (pacote, id)")
+
+    if eh_sqlite():
+        _criar_gatilhos_catalogo(conn, "pacotes")
+        _criar_gatilhos_versao(conn, "pacotes", "bosses")
+    atualizar_estatisticas(conn)
+
+
+def _m017_pacotes_usuario(conn):
+    """Pacotes ativos de cada personagem; os existentes ficam com o jogo base."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS personagem_pacotes (
+            personagem_id INTEGER NOT NULL REFERENCES jogadores_personagens (id) ON DELETE CASCADE,
+            pacote TEXT NOT NULL,
+            PRIMARY KEY (personagem_id, pacote)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO personagem_pacotes (personagem_id, pacote)
+        SELECT id, 'base' FROM jogadores_personagens
+    """)
+
+def _m018_sincronizacao_jornada_usuario(conn):
+    """Versão do catálogo com que a jornada de cada personagem foi sincronizada por último."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jornada_sincronizacao (
+            personagem_id INTEGER PRIMARY KEY REFERENCES jogadores_personagens (id) ON DELETE CASCADE,
+            versao_catalogo INTEGER NOT NULL
+        )
+    """)
+
+def _m019_resumo_jornada_usuario(conn):
+    """Resumo da jornada por personagem, level, localidade e status (painel da jornada)."""
+    # level e localidade vazios ('') no lugar de NULL: fazem parte da chave do upsert
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jornada_resumo (
+            personagem_id INTEGER NOT NULL REFERENCES jogadores_personagens (id) ON DELETE CASCADE,
+            level TEXT NOT NULL DEFAULT '',
+            level_ord INTEGER,
+            localidade TEXT NOT NULL DEFAULT '',
+            status_boss TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            runes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (personagem_id, level, localidade, status_boss)
+        )
+    """)
+    # O resumo depende do catálogo (em shards, outro arquivo): sem marcador, cada
+    # jornada é sincronizada de novo na próxima seleção e o resumo é montado ali
+    conn.execute("DELETE FROM jornada_sincronizacao")
+
+def _m021_visao_jornada_pacotes_principal(conn):
+    """jornada_detalhada só com os bosses dos pacotes ativos do personagem (o progresso dos demais é mantido)."""
+    conn.execute("DROP VIEW IF EXISTS jornada_detalhada")
+    conn.execute("""
+        CREATE VIEW jornada_detalhada AS
+        SELECT j.id, j.personagem_id, j.boss_id,
+               b.nome, b.localidade, b.location, b.runes, b.loot, b.stance,
+               b.tipo_dano_pref, b.resistencia, b.fraquezas, b.resistencias, bl.level,
+               bl.level_ord, bl.level_min, bl.level_max,
+               j.status_boss, j.morto_em
+        FROM jornada j
+        JOIN bosses b ON b.id = j.boss_id
+        JOIN personagem_pacotes p ON p.personagem_id = j.personagem_id AND p.pacote = b.pacote
+        LEFT JOIN boss_levels bl ON bl.chave = b.chave
+    """)
+
+def _m022_recalcular_mascaras_dano_principal(conn):
+    """Máscaras de dano calculadas de novo (frases "vulnerável"/"nenhuma" e fraqueza sem resistência)."""
+    # Com as máscaras nulas, completar_campos_numericos as recalcula na inicialização
+    conn.execute("UPDATE bosses SET fraquezas = NULL, resistencias = NULL")
+
+def _m023_remover_indice_localidade_nome_principal(conn):
+    """Remove o índice de expressão da migração 002: os joins passaram a usar a coluna `chave` (idx_boss_levels_chave)."""
+    conn.execute("DROP INDEX IF EXISTS idx_boss_levels_localidade_nome")
+
+# (versão, descrição, parte principal, parte por usuário)
+MIGRACOES = [
+    (1, "Esquema base", _m001_esquema_base_principal, _m001_esquema_base_usuario),
+    (2, "Índices das consultas de jornada, personagens e níveis",
+     _m002_indices_consultas_principal, _m002_indices_consultas_usuario),
+    (3, "Contador de versão do catálogo", _m003_versao_catalogo_principal, None),
+    (4, "Histórico de manutenção", _m004_log_manutencao_principal, None),
+    (5, "Chave inteira de personagem em jornada, build e build_weapon", None, _m005_chave_personagem_usuario),
+    (6, "Jornada normalizada: referência ao boss, status e data da morte", None, _m006_jornada_normalizada_usuario),
+    # Só no banco principal: em shards o catálogo está anexado e a visão é temporária (repositorios.jornadas)
+    (7, "Visão jornada_detalhada", _m007_visao_jornada_principal, None),
+    (8, "Chave normalizada de boss indexada em bosses e boss_levels", _m008_chave_boss_principal, None),
+    (9, "Level e stance como inteiros", _m009_colunas_numericas_principal, None),
+    (10, "Chaves estrangeiras com exclusão em cascata e limpeza de órfãos", None, _m010_chaves_estrangeiras_usuario),
+    (11, "Visão jornada_detalhada recriada", _m011_visao_jornada_principal, None),
+    (12, "Contadores de alteração (data_version)", _m012_versoes_principal, _m012_versoes_usuario),
+    (13, "Registro de importação dos CSVs do catálogo", _m013_importacao_csv_principal, None),
+    (14, "Armas sem repetição e tipos em weapon_tipos", _m014_weapons_unicas_principal, None),
+    (15, "Loot dos bosses normalizado em boss_loot", _m015_boss_loot_principal, None),
+    (16, "Fraquezas e resistências como máscaras de bits", _m016_mascaras_dano_principal, None),
+    (17, "Pacotes de conteúdo e pacotes ativos por personagem", _m017_pacotes_principal, _m017_pacotes_usuario),
+    (18, "Marcador de sincronização da jornada com o catálogo", None, _m018_sincronizacao_jornada_usuario),
+    (19, "Resumo da jornada por level, localidade e status", None, _m019_resumo_jornada_usuario),
+    # 20: reimportação dos tipos de arma, incorporada à migração 014
+    (21, "Visão jornada_detalhada filtrada pelos pacotes ativos", _m021_visao_jornada_pacotes_principal, None),
+    (22, "Máscaras de fraquezas e resistências recalculadas", _m022_recalcular_mascaras_dano_principal, None),
+    (23, "Índice sem uso em boss_levels removido", _m023_remover_indice_localidade_nome_principal, None),
+]
+
+
+# === Execução ===
+def versao_atual(conn):
+    """Retorna a maior versão de esquema já aplicada (0 em banco novo)."""
+    return conn.execute("SELECT COALESCE(MAX(versao), 0) FROM schema_version").fetchone()[0]
+
+
+def aplicar_migracoes(caminho=None, shard=False):
+    """
+    Aplica, em ordem, as migrações pendentes no banco informado (o principal por padrão).
+
+    Em um shard de usuário (`shard=True`) só rodam as partes por usuário; as
+    versões sem essa parte são apenas registradas. Chamadas seguintes no
+    processo, para o mesmo banco, são gratuitas.
+    """
+    chave = str(caminho or "principal")
+    if chave in _bancos_atualizados:
+        return
+
+    with _lock:
+        if chave in _bancos_atualizados:
+            return
+
+        conn = conectar(caminho)
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    versao INTEGER PRIMARY KEY,
+                    descricao TEXT NOT NULL,
+                    aplicada_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+        for versao, descricao, parte_principal, parte_usuario in MIGRACOES:
+            if versao <= versao_atual(conn):
+                continue
+            # O lock de escrita serializa migrações entre processos distintos
+            if conn.in_transaction:
+                conn.commit()
+            iniciar_escrita(conn)
+            try:
+                if versao <= versao_atual(conn):
+                    conn.rollback()
+                    continue
+                if parte_principal and not shard:
+                    parte_principal(conn)
+                if parte_usuario:
+                    parte_usuario(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (versao, descricao) VALUES (?, ?)",
+                    (versao, descricao),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            if not shard:
+                print(f"[OK] Migração {versao:03d} aplicada: {descricao}")
+
+        _bancos_atualizados.add(chave)
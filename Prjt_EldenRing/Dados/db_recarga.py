@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+
+from db_importacao import FONTES, importar_catalogo
+from repositorios.jornadas import completar_jornadas
+
+# === Recarga a quente dos CSVs do catálogo ===
+# Uma thread em segundo plano confere, a cada INTERVALO_RECARGA_S, a data de
+# modificação e o tamanho dos CSVs do catálogo. Um arquivo alterado só é
+# reimportado quando a assinatura se repete em duas verificações seguidas
+# (a cópia do arquivo terminou). A importação compara o hash e grava só as
+# linhas que mudaram; a réplica do catálogo fica congelada durante ela e as
+# sessões em andamento passam para o catálogo novo na leitura seguinte, sem
+# reiniciar o servidor. Bosses novos entram em todas as jornadas de uma vez
+# (completar_jornadas).
+
+INTERVALO_RECARGA_S = 5
+RECARGA_ATIVA = os.environ.get("ELDEN_RECARGA_CSV", "1") == "1"
+
+_lock = threading.Lock()
+_thread = None
+_vistas = {}       # arquivo -> assinatura na última verificação
+_importadas = {}   # arquivo -> assinatura na última importação tentada
+
+
+def _assinatura(arquivo):
+    """(mtime em ns, tamanho) do arquivo, ou None se ele não existir."""
+    try:
+        estado = arquivo.stat()
+    except FileNotFoundError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
+
+
+def fontes_alteradas():
+    """Fontes cujo CSV mudou desde a última importação e já está estável; atualiza as assinaturas vistas."""
+    alteradas = []
+    for fonte in FONTES:
+        atual = _assinatura(fonte.arquivo)
+        anterior, _vistas[fonte.arquivo] = _vistas.get(fonte.arquivo), atual
+        if atual is not None and atual == anterior and atual != _importadas.get(fonte.arquivo):
+            alteradas.append(fonte)
+    return alteradas
+
+
+def verificar_csvs():
+    """Reimporta os CSVs alterados (uma verificação); devolve os resumos da importação."""
+    with _lock:
+        alteradas = fontes_alteradas()
+        if not alteradas:
+            return []
+        # Marcadas antes de importar: um arquivo com erro só é tentado de novo quando mudar
+        for fonte in alteradas:
+            _importadas[fonte.arquivo] = _vistas[fonte.arquivo]
+        resumos = importar_catalogo(fontes=alteradas)
+        if any(resumo.inseridas for resumo in resumos):
+            completar_jornadas()
+        return resumos
+
+
+def _registrar_estado_atual():
+    """Considera importados os CSVs como estão agora (a inicialização acabou de importá-los)."""
+    for fonte in FONTES:
+        _vistas[fonte.arquivo] = _importadas[fonte.arquivo] = _assinatura(fonte.arquivo)
+
+
+# === Observador ===
+def _laco_recarga():
+    while True:
+        time.sleep(INTERVALO_RECARGA_S)
+        try:
+            verificar_csvs()
+        except Exception as e:
+            print(f"[ERRO] Falha na recarga dos CSVs do catálogo: {e}")
+
+
+def iniciar_recarga():
+    """Inicia (uma vez por processo) a thread que reimporta os CSVs do catálogo alterados."""
+    global _thread
+    if not RECARGA_ATIVA:
+        return
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _registrar_estado_atual()
+            _thread = threading.Thread(target=_laco_recarga, name="recarga-csv", daemon=True)
+            _thread.start()
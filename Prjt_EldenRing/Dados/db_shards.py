@@ -0,0 +1,116 @@
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+
+from db_backend import eh_sqlite
+from db_conexao import conectar
+from db_migracoes import aplicar_migracoes
+
+# === Modo shards (opcional) ===
+# Com ELDEN_SHARDS=1, personagens (e seus pacotes ativos), jornada, build e
+# build_weapon de cada usuário ficam em um arquivo próprio em Dados/shards/.
+# O banco principal (usuários e catálogo: bosses, boss_levels, weapons,
+# pacotes) é anexado a cada shard como `catalogo`, somente leitura. Assim o
+# lock de escrita e o crescimento do arquivo de um usuário não afetam os
+# demais. Só existe no backend SQLite.
+
+MODO_SHARDS = eh_sqlite() and os.environ.get("ELDEN_SHARDS", "0") == "1"
+SHARDS_DIR = Path(__file__).resolve().parent / "shards"
+
+# Tabelas copiadas do banco principal na criação do shard, com o filtro do usuário
+_TABELAS_DO_USUARIO = [
+    ("jogadores_personagens", "nome_usuario_criador = :usuario"),
+    ("jornada", "personagem_id IN (SELECT id FROM main.jogadores_personagens)"),
+    ("personagem_pacotes", "personagem_id IN (SELECT id FROM main.jogadores_personagens)"),
+    ("build", "personagem_id IN (SELECT id FROM main.jogadores_personagens)"),
+    ("build_weapon", "personagem_id IN (SELECT id FROM main.jogadores_personagens)"),
+]
+
+_lock = threading.Lock()
+_preparados = set()
+
+
+def usuario_da_sessao():
+    """Login da sessão Streamlit atual (None fora de uma sessão)."""
+    try:
+        import streamlit as st
+        return st.session_state.get("usuario_logado")
+    except Exception:
+        return None
+
+
+def _arquivo_shard(usuario):
+    seguro = re.sub(r"[^\w.-]", "_", usuario)[:40]
+    resumo = hashlib.sha1(usuario.encode("utf-8")).hexdigest()[:8]
+    return SHARDS_DIR / f"{seguro}-{resumo}.db"
+
+
+def banco_do_usuario(usuario=None):
+    """
+    Caminho do banco com os dados mutáveis do usuário (ou da sessão atual).
+
+    Retorna None — o banco principal — fora do modo shards ou quando não há
+    usuário identificado. Serve direto para `conectar()` e para `banco=` do escritor.
+    """
+    if not MODO_SHARDS:
+        return None
+    usuario = usuario or usuario_da_sessao()
+    if not usuario:
+        return None
+
+    caminho = _arquivo_shard(usuario)
+    if str(caminho) not in _preparados:
+        _preparar_shard(caminho, usuario)
+    return caminho
+
+
+def bancos_de_usuarios():
+    """
+    Bancos com dados de usuários, para tarefas que passam por todos eles.
+
+    Fora do modo shards, só o principal (None); no modo shards, os shards
+    existentes em SHARDS_DIR, já com as migrações aplicadas.
+    """
+    if not MODO_SHARDS:
+        return [None]
+    caminhos = sorted(SHARDS_DIR.glob("*.db"))
+    for caminho in caminhos:
+        aplicar_migracoes(caminho, shard=True)
+    return caminhos
+
+
+def conectar_usuario(usuario=None):
+    """Conexão pooled com o banco de dados do usuário (shard ou principal)."""
+    return conectar(banco_do_usuario(usuario))
+
+
+def _preparar_shard(caminho, usuario):
+    """Cria/migra o shard e, na primeira vez, copia os dados do usuário do banco principal."""
+    with _lock:
+        if str(caminho) in _preparados:
+            return
+
+        SHARDS_DIR.mkdir(exist_ok=True)
+        aplicar_migracoes(caminho, shard=True)
+
+        conn = conectar(caminho)
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS main.shard_origem (
+                    usuario TEXT PRIMARY KEY,
+                    importado_em TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            if conn.execute("SELECT 1 FROM main.shard_origem").fetchone() is None:
+                for tabela, filtro in _TABELAS_DO_USUARIO:
+                    colunas = ", ".join(linha[1] for linha in conn.execute(f"PRAGMA main.table_info({tabela})"))
+                    conn.execute(
+                        f"INSERT INTO main.{tabela} ({colunas}) "
+                        f"SELECT {colunas} FROM catalogo.{tabela} WHERE {filtro}",
+                        {"usuario": usuario},
+                    )
+                conn.execute("INSERT INTO main.shard_origem (usuario) VALUES (?)", (usuario,))
+
+        _preparados.add(str(caminho))
@@ -0,0 +1,68 @@
+from db_backend import eh_sqlite
+from db_conexao import conectar
+from db_shards import conectar_usuario
+
+# === Contadores de alteração (data_version) ===
+# Gatilhos (migração 012) incrementam um contador por escopo a cada escrita:
+#
+#   escopo        chave
+#   bosses        ''                    (bosses, boss_loot e pacotes; banco principal)
+#   boss_levels   ''                    (banco principal)
+#   weapons       ''                    (weapons e weapon_tipos; banco principal)
+#   personagens   '' | nome do usuário  (banco do usuário)
+#   jornada       '' | personagem_id    (banco do usuário)
+#   build         '' | personagem_id    (build e build_weapon; banco do usuário)
+#
+# Um cache guarda a versão lida junto com o valor e só refaz a consulta
+# quando a versão mudar: a verificação é uma busca pela chave primária.
+# No PostgreSQL não há gatilhos de versão e as funções devolvem None
+# (o chamador deve tratar como "sempre alterado").
+
+
+def _ler_versao(conn, escopo, chave):
+    linha = conn.execute(
+        "SELECT versao FROM data_version WHERE escopo = ? AND chave = ?",
+        (escopo, str(chave)),
+    ).fetchone()
+    return linha[0] if linha else 0
+
+
+def versao_catalogo(tabela):
+    """Versão de bosses, boss_levels ou weapons (0 se nunca alterada)."""
+    if not eh_sqlite():
+        return None
+    with conectar() as conn:
+        return _ler_versao(conn, tabela, "")
+
+
+def versao_catalogo_jornada():
+    """Versão do catálogo lido pela jornada e pelo seu resumo (bosses e boss_levels)."""
+    if not eh_sqlite():
+        return None
+    # Os dois contadores só crescem: a soma muda sempre que um deles muda
+    with conectar() as conn:
+        return _ler_versao(conn, "bosses", "") + _ler_versao(conn, "boss_levels", "")
+
+
+def versao_personagens(usuario):
+    """Versão dos personagens cadastrados pelo usuário."""
+    if not eh_sqlite():
+        return None
+    with conectar_usuario(usuario) as conn:
+        return _ler_versao(conn, "personagens", usuario)
+
+
+def versao_jornada(personagem_id):
+    """Versão da jornada do personagem (banco do usuário da sessão)."""
+    if not eh_sqlite():
+        return None
+    with conectar_usuario() as conn:
+        return _ler_versao(conn, "jornada", personagem_id)
+
+
+def versao_build(personagem_id):
+    """Versão da build e das armas do personagem (banco do usuário da sessão)."""
+    if not eh_sqlite():
+        return None
+    with conectar_usuario() as conn:
+        return _ler_versao(conn, "build", personagem_id)
@@ -0,0 +1,14 @@
+"""
+Camada de acesso a dados da aplicação, um repositório por agregado.
+
+    usuarios     -> user_jogador (login, cadastro, permissões)
+    personagens  -> jogadores_personagens
+    pacotes      -> pacotes de conteúdo e os ativos de cada personagem
+    bosses       -> bosses, boss_levels e boss_loot (catálogo)
+    jornadas     -> jornada de cada personagem e seu resumo (jornada_resumo)
+    builds       -> build e build_weapon
+    weapons      -> weapons e weapon_tipos (catálogo)
+
+Consultas pequenas devolvem as NamedTuples de `linhas`; DataFrames ficam
+restritos ao que é exibido em tabelas e gráficos.
+"""
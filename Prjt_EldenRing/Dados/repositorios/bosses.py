@@ -0,0 +1,394 @@
+import pandas as pd
+import os
+import re
+
+from db_backend import ler_dataframe
+from db_catalogo import conectar_catalogo, invalidar_catalogo
+from db_conexao import conectar
+from db_escrita import escrever, escrever_em_lote, executar_escrita
+
+# === Caminhos base ===
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_PATH = os.path.join(BASE_DIR, 'elden_ring_boss_list.csv')
+CSV_LEVELS_PATH = os.path.join(BASE_DIR, 'elden_ring_boss_lvl.csv')
+
+# Ex.: "01_Lvl 01 - 20" -> ordem 1, level 1 a 20
+PADRAO_LEVEL = r"^(\d+)_Lvl\s*(\d+)\s*-\s*(\d+)"
+
+# Ex.: "Bloodrose; 5x Smithing Stone (6)" -> ("Bloodrose", 1), ("Smithing Stone (6)", 5)
+SEPARADORES_LOOT = r"[;,]"
+PADRAO_QUANTIDADE = r"^(\d+)\s*x\s+(.+)$"
+SEM_LOOT = {"behold nothing"}  # texto usado no CSV para bosses sem drop
+
+# Vocabulário fixo de tipos de dano e efeitos. Cada tipo é um bit das máscaras
+# bosses.fraquezas e bosses.resistencias (INTEGER): a posição no dicionário
+# define o bit, então tipos novos só podem ser acrescentados ao final.
+# Os padrões casam com o texto sem acentos e em minúsculas.
+TIPOS_DANO = {
+    "Físico": r"\bfisico\b|\bstandard\b",
+    "Corte": r"\bcorte\b|\bslash\b",
+    "Perfuração": r"\bperfura|\bpierce\b|\bthrust\b",
+    "Acerto": r"\bacerto\b|\bstrike\b|\bimpacto\b",
+    "Magia": r"\bmagia\b",
+    "Fogo": r"\bfogo\b",
+    "Raio": r"\braio\b",
+    "Sagrado": r"\bsagrado\b",
+    "Sangramento": r"\bsangramento\b",
+    "Congelamento": r"\bcongelamento\b|\bgelo\b",
+    "Veneno": r"\bveneno\b",
+    "Podridão Escarlate": r"\bpodridao\b",
+    "Sono": r"\bsono\b",
+    "Loucura": r"\bloucura\b",
+    "Morte": r"\bmorte\b",
+}
+BITS_DANO = {tipo: 1 << posicao for posicao, tipo in enumerate(TIPOS_DANO)}
+
+# O texto de resistência é lido frase a frase (separadas por ponto).
+# Ex.: "⚔️ Corte (Slash). Fraco a Acerto (Strike)." -> resiste a Corte, fraco a Acerto
+PADRAO_FRACO_A = r"^(.*?)(?:\bfraco a\b(.*))?$"
+# Ex.: "🩸 Sangramento e ❄️ Congelamento (..., ainda vulnerável)." -> a frase inteira é fraqueza
+PADRAO_VULNERAVEL = r"\bvulnerave(?:l|is)\b"
+# Ex.: "Nenhuma resistência notável, ..." / "Não possui resistências de boss." -> a frase não cita tipos
+PADRAO_SEM_TIPOS = r"^\s*(?:nenhuma|nenhum|sem)\b|\bnao possui\b"
+
+
+# === Campos numéricos derivados do texto ===
+def faixas_de_level(levels):
+    """DataFrame com level_ord, level_min e level_max (inteiros) extraídos do texto do level."""
+    faixas = levels.astype("string").str.extract(PADRAO_LEVEL).astype(float).astype("Int64")
+    faixas.columns = ["level_ord", "level_min", "level_max"]
+    return faixas
+
+
+def valores_de_stance(stances):
+    """Primeiro valor numérico da stance ("100/75" -> 100), ou nulo se não houver."""
+    return stances.astype("string").str.extract(r"(\d+)")[0].astype(float).astype("Int64")
+
+
+def _valor_stance(stance):
+    valor = valores_de_stance(pd.Series([stance])).iloc[0]
+    return None if pd.isna(valor) else int(valor)
+
+
+def _normalizar_texto(textos):
+    """Texto sem acentos e emojis, em minúsculas (nulos viram texto vazio)."""
+    return (
+        textos.astype("string").fillna("")
+        .str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+        .str.lower()
+    )
+
+
+def mascaras_de_dano(textos):
+    """Máscara de bits (BITS_DANO) com os tipos de dano citados em cada texto."""
+    normalizados = _normalizar_texto(textos)
+    mascaras = pd.Series(0, index=textos.index, dtype="int64")
+    for tipo, padrao in TIPOS_DANO.items():
+        mascaras |= normalizados.str.contains(padrao, regex=True).astype("int64") * BITS_DANO[tipo]
+    return mascaras
+
+
+def _frases_de_resistencia(resistencias):
+    """Trechos de fraqueza e de resistência do texto, reunidos por boss (mesmo índice da entrada)."""
+    frases = _normalizar_texto(resistencias).str.split(".").explode()
+    partes = frases.str.extract(PADRAO_FRACO_A, flags=re.DOTALL).fillna("")
+    vulneravel = partes[0].str.contains(PADRAO_VULNERAVEL, regex=True)
+    sem_tipos = partes[0].str.contains(PADRAO_SEM_TIPOS, regex=True)
+    trechos = pd.DataFrame({
+        "fraco": partes[1] + " " + partes[0].where(vulneravel, ""),
+        "resiste": partes[0].where(~vulneravel & ~sem_tipos, ""),
+    })
+    return trechos.groupby(level=0, sort=False).agg(" ".join).reindex(resistencias.index)
+
+
+def fraquezas_e_resistencias(tipos_dano_pref, resistencias):
+    """
+    DataFrame com as máscaras fraquezas e resistencias dos bosses.
+
+    Fraquezas vêm do tipo de dano preferido e, no texto de resistência, do
+    trecho "Fraco a ..." e das frases que dizem "vulnerável"; o restante desse
+    texto (inclusive "Imune a ...") são resistências. Frases como "Nenhuma
+    resistência notável" não contam, e um tipo que é fraqueza nunca é também
+    resistência.
+    """
+    trechos = _frases_de_resistencia(resistencias)
+    fraquezas = mascaras_de_dano(tipos_dano_pref) | mascaras_de_dano(trechos["fraco"])
+    return pd.DataFrame({
+        "fraquezas": fraquezas,
+        "resistencias": mascaras_de_dano(trechos["resiste"]) & ~fraquezas,
+    }, index=tipos_dano_pref.index)
+
+
+def _mascaras_boss(tipo_dano_pref, resistencia):
+    mascaras = fraquezas_e_resistencias(pd.Series([tipo_dano_pref]), pd.Series([resistencia])).iloc[0]
+    return int(mascaras["fraquezas"]), int(mascaras["resistencias"])
+
+
+def mascara_de_tipos(tipos):
+    """Máscara com os bits dos tipos informados (nomes de TIPOS_DANO); 0 sem tipos."""
+    mascara = 0
+    for tipo in tipos:
+        mascara |= BITS_DANO[tipo]
+    return mascara
+
+
+def completar_campos_numericos():
+    """Preenche os campos numéricos de linhas importadas antes deles existirem (uma vez por banco)."""
+    with conectar() as conn:
+        levels = ler_dataframe(
+            "SELECT id, level FROM boss_levels WHERE level IS NOT NULL AND level_ord IS NULL", conn
+        )
+        bosses = ler_dataframe(
+            "SELECT id, stance FROM bosses WHERE stance IS NOT NULL AND stance_valor IS NULL", conn
+        )
+        danos = ler_dataframe(
+            "SELECT id, tipo_dano_pref, resistencia FROM bosses WHERE fraquezas IS NULL OR resistencias IS NULL", conn
+        )
+
+    levels = levels.join(faixas_de_level(levels["level"])).dropna(subset=["level_ord"])
+    bosses["stance_valor"] = valores_de_stance(bosses["stance"])
+    bosses = bosses.dropna(subset=["stance_valor"])
+    danos = danos.join(fraquezas_e_resistencias(danos["tipo_dano_pref"], danos["resistencia"]))
+    if levels.empty and bosses.empty and danos.empty:
+        return
+
+    escrever_em_lote(
+        "UPDATE boss_levels SET level_ord = ?, level_min = ?, level_max = ? WHERE id = ?",
+        [
+            (int(ordem), int(minimo), int(maximo), int(id_level))
+            for id_level, ordem, minimo, maximo
+            in levels[["id", "level_ord", "level_min", "level_max"]].itertuples(index=False, name=None)
+        ]
+    )
+    escrever_em_lote(
+        "UPDATE bosses SET stance_valor = ? WHERE id = ?",
+        [(int(valor), int(id_boss)) for id_boss, valor in zip(bosses["id"], bosses["stance_valor"])]
+    )
+    escrever_em_lote(
+        "UPDATE bosses SET fraquezas = ?, resistencias = ? WHERE id = ?",
+        [
+            (int(fraquezas), int(resistencias), int(id_boss))
+            for id_boss, fraquezas, resistencias
+            in danos[["id", "fraquezas", "resistencias"]].itertuples(index=False, name=None)
+        ]
+    )
+    invalidar_catalogo()
+
+
+# === Loot normalizado (boss_loot) ===
+def itens_de_loot(loot):
+    """Pares (item, quantidade) do texto livre de loot, um por item."""
+    itens = {}
+    if loot is None or pd.isna(loot):
+        return []
+    for parte in re.split(SEPARADORES_LOOT, str(loot)):
+        parte = parte.strip()
+        if not parte or parte.lower() in SEM_LOOT:
+            continue
+        quantidade = re.match(PADRAO_QUANTIDADE, parte, re.IGNORECASE)
+        item, unidades = (quantidade[2].strip(), int(quantidade[1])) if quantidade else (parte, 1)
+        itens[item] = itens.get(item, 0) + unidades
+    return list(itens.items())
+
+
+def sincronizar_loot(conn, ids=None):
+    """
+    Refaz boss_loot a partir de bosses.loot para os bosses informados (todos, sem `ids`).
+
+    Roda na transação de quem chama e grava só as diferenças: linhas iguais
+    não são reescritas e não disparam os gatilhos de versão do catálogo.
+    """
+    def _filtro(coluna):
+        return f"WHERE {coluna} IN ({', '.join('?' * len(ids))})" if ids is not None else ""
+
+    if ids is not None:
+        ids = [int(i) for i in ids]
+        if not ids:
+            return
+    parametros = tuple(ids or ())
+
+    desejado = {
+        (id_boss, item): quantidade
+        for id_boss, loot in conn.execute(f"SELECT id, loot FROM bosses {_filtro('id')}", parametros).fetchall()
+        for item, quantidade in itens_de_loot(loot)
+    }
+    atual = {
+        (id_boss, item): quantidade
+        for id_boss, item, quantidade in conn.execute(
+            f"SELECT boss_id, item, quantidade FROM boss_loot {_filtro('boss_id')}", parametros
+        ).fetchall()
+    }
+
+    remover = [par for par in atual if par not in desejado]
+    gravar = [(*par, quantidade) for par, quantidade in desejado.items() if atual.get(par) != quantidade]
+    if remover:
+        conn.executemany("DELETE FROM boss_loot WHERE boss_id = ? AND item = ?", remover)
+    if gravar:
+        conn.executemany("""
+            INSERT INTO boss_loot (boss_id, item, quantidade) VALUES (?, ?, ?)
+            ON CONFLICT (boss_id, item) DO UPDATE SET quantidade = excluded.quantidade
+        """, gravar)
+
+
+def relacionar_loot(conn, df):
+    """Sincroniza boss_loot dos bosses de um bloco importado (gancho de db_importacao)."""
+    ids = [
+        linha[0]
+        for localidade, nome in df[["localidade", "nome"]].itertuples(index=False, name=None)
+        for linha in conn.execute(
+            "SELECT id FROM bosses WHERE chave = LOWER(TRIM(?)) || '|' || LOWER(TRIM(?))", (localidade, nome)
+        ).fetchall()
+    ]
+    sincronizar_loot(conn, ids)
+
+
+# === Preparação dos CSVs (usada por db_importacao) ===
+def preparar_bosses(df):
+    """Converte um bloco de elden_ring_boss_list.csv nas colunas da tabela bosses."""
+    # Tratamento da coluna 'Runes'
+    df["Runes"] = (
+        df["Runes"]
+        .astype(str)
+        .str.replace(",", "", regex=False)
+        .str.strip()
+        .replace("", "0")
+        .astype(int)
+    )
+
+    # Renomeia colunas conforme esperado pelo banco
+    df = df.rename(columns={
+        "Name": "nome",
+        "Localidade": "localidade",
+        "Location": "location",
+        "Runes": "runes",
+        "Loot": "loot",
+        "Stance": "stance",
+        "Pref. dmg. type": "tipo_dano_pref",
+        "Resistencia": "resistencia",
+        "Pacote": "pacote"
+    })
+    # Coluna opcional no CSV: sem ela (ou vazia), o boss é do jogo base
+    df["pacote"] = df["pacote"].fillna("base").str.strip() if "pacote" in df else "base"
+    df["stance_valor"] = valores_de_stance(df["stance"])
+    return df.join(fraquezas_e_resistencias(df["tipo_dano_pref"], df["resistencia"]))
+
+
+def preparar_boss_levels(df):
+    """Converte um bloco de elden_ring_boss_lvl.csv nas colunas da tabela boss_levels."""
+    df = df.rename(columns={
+        "Localidade": "localidade",
+        "Name": "nome",
+        "Level": "level"
+    })
+    return df.join(faixas_de_level(df["level"]))
+
+
+# === Consultas ===
+def listar_bosses():
+    """Retorna todos os bosses com nomes de colunas compatíveis com a visualização."""
+    with conectar_catalogo() as conn:
+        df = ler_dataframe("""
+            SELECT
+                id AS "ID",
+                nome AS "Nome",
+                localidade AS "Localidade",
+                location AS "Location",
+                runes AS "Runes",
+                loot AS "Loot",
+                stance AS "Stance",
+                tipo_dano_pref AS "Tipo de Dano Preferido",
+                resistencia AS "Resistência",
+                fraquezas,
+                resistencias
+            FROM bosses
+        """, conn)
+        return df
+
+
+def listar_itens_loot():
+    """Itens distintos de boss_loot em ordem alfabética (opções da busca por loot)."""
+    with conectar_catalogo() as conn:
+        return [linha[0] for linha in conn.execute("SELECT DISTINCT item FROM boss_loot ORDER BY item")]
+
+
+def bosses_que_dropam(item):
+    """Bosses que dropam o item, com a quantidade (busca pelo índice de item)."""
+    with conectar_catalogo() as conn:
+        return ler_dataframe("""
+            SELECT b.nome, b.localidade, b.location, b.runes, l.quantidade
+            FROM boss_loot l
+            JOIN bosses b ON b.id = l.boss_id
+            WHERE l.item = ?
+            ORDER BY b.localidade, b.nome
+        """, conn, params=(item,))
+
+
+# === Manutenção do catálogo ===
+def inserir_boss(nome, localidade, location, runes, loot, stance, tipo_dano_pref, resistencia, pacote="base"):
+    """Insere um novo boss no banco (no pacote de conteúdo informado), com o loot normalizado em boss_loot."""
+    def _gravar(conn):
+        id_boss = conn.execute("""
+            INSERT INTO bosses (
+                nome, localidade, location, runes,
+                loot, stance, stance_valor, tipo_dano_pref, resistencia, fraquezas, resistencias, pacote
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
+        """, (nome, localidade, location, runes, loot, stance, _valor_stance(stance),
+              tipo_dano_pref, resistencia, *_mascaras_boss(tipo_dano_pref, resistencia), pacote)).fetchone()[0]
+        sincronizar_loot(conn, [id_boss])
+
+    executar_escrita(_gravar)
+    invalidar_catalogo()
+
+
+def atualizar_boss(id, nome, localidade, location, runes, loot, stance, tipo_dano_pref, resistencia):
+    """Atualiza um boss existente com base no ID (e o seu loot em boss_loot)."""
+    def _gravar(conn):
+        conn.execute("""
+            UPDATE bosses SET
+                nome = ?, localidade = ?, location = ?, runes = ?,
+                loot = ?, stance = ?, stance_valor = ?, tipo_dano_pref = ?, resistencia = ?,
+                fraquezas = ?, resistencias = ?
+            WHERE id = ?
+        """, (nome, localidade, location, runes, loot, stance, _valor_stance(stance),
+              tipo_dano_pref, resistencia, *_mascaras_boss(tipo_dano_pref, resistencia), id))
+        sincronizar_loot(conn, [id])
+
+    executar_escrita(_gravar)
+    invalidar_catalogo()
+
+
+def excluir_boss(id):
+    """Remove um boss do banco com base no ID."""
+    escrever("DELETE FROM bosses WHERE id = ?", (id,))
+    invalidar_catalogo()
+
+# Testes locais: textos reais do CSV que exigem tratamento especial
+if __name__ == "__main__":
+    casos = [
+        # (tipo_dano_pref, resistencia, fraquezas, resistencias)
+        ("🩸 Sangramento, ❄️ Congelamento.",
+         " 🩸 Sangramento e ❄️ Congelamento (menos que alguns outros chefes, ainda vulnerável).",
+         {"Sangramento", "Congelamento"}, set()),
+        ("Nenhuma fraqueza notável (tutorial).", "Nenhuma resistência notável, serve como tutorial.", set(), set()),
+        ("Não combate (se rende).",
+         "Não é um chefe de combate tradicional; quando confrontado, ele se rende. Não possui resistências de boss.",
+         set(), set()),
+        ("⚡ Raio, 🏏 Acerto (Strike).",
+         "  🩸 Sangramento. ❄️ Congelamento. Fraco a ⚡ Raio e Acerto (Strike).",
+         {"Raio", "Acerto"}, {"Sangramento", "Congelamento"}),
+        ("🔥 Fogo, 🩸 Sangramento.", " 🔥 Fogo, 🩸 Sangramento.", {"Fogo", "Sangramento"}, set()),
+        ("🔥 Fogo.", " 🔥 Fogo. Imune a  🍁 Podridão Escarlate, 💤 Sono, 🤡 Loucura, Morte.",
+         {"Fogo"}, {"Podridão Escarlate", "Sono", "Loucura", "Morte"}),
+        ("🩸 Sangramento.", None, {"Sangramento"}, set()),
+    ]
+    for tipo_dano_pref, resistencia, fraquezas, resistencias in casos:
+        obtido = _mascaras_boss(tipo_dano_pref, resistencia)
+        esperado = (mascara_de_tipos(fraquezas), mascara_de_tipos(resistencias))
+        assert obtido == esperado, f"{resistencia!r}: {obtido} != {esperado}"
+
+    # Nenhum boss do CSV pode ser fraco e resistente ao mesmo tipo
+    df = pd.read_csv(CSV_PATH)
+    mascaras = fraquezas_e_resistencias(df["Pref. dmg. type"], df["Resistencia"])
+    assert not (mascaras["fraquezas"] & mascaras["resistencias"]).any()
+    print(f"✅ {len(casos)} casos e {len(df)} bosses do CSV conferidos.")
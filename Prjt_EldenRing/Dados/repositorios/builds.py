@@ -0,0 +1,67 @@
+import pandas as pd
+
+from db_backend import ler_dataframe
+from db_escrita import escrever, escrever_em_lote
+from db_shards import banco_do_usuario, conectar_usuario
+from repositorios.linhas import Build
+
+# === Inicializa Build de um Personagem (se ainda não existir) ===
+def inicializar_build_para_personagem(personagem_id: int):
+    with conectar_usuario() as conn:
+        existe = conn.execute("SELECT 1 FROM build WHERE personagem_id = ?", (personagem_id,)).fetchone()
+    # Só enfileira escrita quando falta a linha; a leitura acima é o caminho comum
+    if existe is None:
+        escrever("""
+            INSERT INTO build (
+                personagem_id, vigor, mind, endurance, strength,
+                dexterity, intelligence, faith, arcane
+            ) VALUES (?, 0, 0, 0, 0, 0, 0, 0, 0)
+            ON CONFLICT(personagem_id) DO NOTHING
+        """, (personagem_id,), banco=banco_do_usuario())
+
+# === Obtem os valores da Build de um personagem ===
+def obter_build(personagem_id: int):
+    with conectar_usuario() as conn:
+        linha = conn.execute("""
+            SELECT vigor, mind, endurance, strength, dexterity,
+                   intelligence, faith, arcane
+            FROM build
+            WHERE personagem_id = ?
+        """, (personagem_id,)).fetchone()
+        return Build._make(linha) if linha else None
+
+# === Atualiza os valores da Build ===
+def atualizar_build(personagem_id: int, valores: dict):
+    escrever("""
+        UPDATE build
+        SET vigor = ?, mind = ?, endurance = ?, strength = ?,
+            dexterity = ?, intelligence = ?, faith = ?, arcane = ?
+        WHERE personagem_id = ?
+    """, (
+        valores["vigor"], valores["mind"], valores["endurance"],
+        valores["strength"], valores["dexterity"], valores["intelligence"],
+        valores["faith"], valores["arcane"], personagem_id
+    ), banco=banco_do_usuario())
+
+# === Armas atribuídas à Build (build_weapon) ===
+def salvar_build_weapon(personagem_id: int, df_vertical: pd.DataFrame):
+    # Todas as linhas seguem num único executemany, aplicado em um só commit do escritor
+    escrever_em_lote("""
+        INSERT INTO build_weapon (personagem_id, status, slot, item, valor)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(personagem_id, status, slot)
+        DO UPDATE SET
+            item = excluded.item,
+            valor = excluded.valor
+    """, (
+        (int(personagem_id), row["Status"], int(row["Slot"]), row["Item"], int(row["Valor"]))
+        for _, row in df_vertical.iterrows()
+    ), banco=banco_do_usuario())
+
+def carregar_build_weapon(personagem_id: int) -> pd.DataFrame:
+    """Carrega os dados da build_weapon para um personagem específico."""
+    with conectar_usuario() as conn:
+        return ler_dataframe("""
+            SELECT * FROM build_weapon WHERE personagem_id = ?
+            ORDER BY status, slot
+        """, conn, params=(personagem_id,))
@@ -0,0 +1,300 @@
+from db_backend import eh_sqlite, ler_dataframe
+from db_catalogo import tabelas_catalogo
+from db_escrita import executar_escrita
+from db_shards import banco_do_usuario, bancos_de_usuarios, conectar_usuario
+from db_versoes import versao_catalogo_jornada
+
+# A jornada guarda só (personagem_id, boss_id, status_boss, morto_em); nome,
+# localidade, runas e level vêm do catálogo pela visão jornada_detalhada.
+# Linhas de pacotes desativados continuam na jornada (com o progresso) e
+# ficam fora da visão e do resumo até o pacote voltar a ser ativado.
+# Tabelas do catálogo lidas pelas consultas da jornada (visão e joins)
+TABELAS_JORNADA = ("bosses", "boss_levels", "boss_loot")
+
+_SQL_VISAO = """
+    CREATE TEMP VIEW jornada_detalhada AS
+    SELECT j.id, j.personagem_id, j.boss_id,
+           b.nome, b.localidade, b.location, b.runes, b.loot, b.stance,
+           b.tipo_dano_pref, b.resistencia, b.fraquezas, b.resistencias, bl.level,
+           bl.level_ord, bl.level_min, bl.level_max,
+           j.status_boss, j.morto_em
+    FROM main.jornada j
+    JOIN {bosses} b ON b.id = j.boss_id
+    JOIN main.personagem_pacotes p ON p.personagem_id = j.personagem_id AND p.pacote = b.pacote
+    LEFT JOIN {boss_levels} bl ON bl.chave = b.chave
+"""
+
+# Resumo do painel em jornada_resumo: por (personagem, level, localidade,
+# status), o total de bosses e a soma das runas. É montado de novo a cada
+# ajuste da jornada (sincronização com o catálogo, troca de pacotes) e
+# atualizado na mesma transação que registra um extermínio; o painel lê só ele.
+_SQL_GRUPOS_RESUMO = """
+    SELECT j.personagem_id, COALESCE(bl.level, '') AS level, MIN(bl.level_ord) AS level_ord,
+           COALESCE(b.localidade, '') AS localidade, j.status_boss,
+           COUNT(*) AS total, COALESCE(SUM(b.runes), 0) AS runes
+    FROM jornada j
+    JOIN bosses b ON b.id = j.boss_id
+    JOIN personagem_pacotes p ON p.personagem_id = j.personagem_id AND p.pacote = b.pacote
+    LEFT JOIN boss_levels bl ON bl.chave = b.chave
+    WHERE {filtro}
+    GROUP BY j.personagem_id, COALESCE(bl.level, ''), COALESCE(b.localidade, ''), j.status_boss
+"""
+
+
+def _conectar_jornada():
+    """
+    Conexão do usuário com a visão jornada_detalhada lendo o catálogo atual.
+
+    Devolve também os nomes das tabelas de TABELAS_JORNADA (dicionário),
+    resolvidos de uma vez: a visão e os joins da consulta leem a mesma
+    geração da réplica.
+
+    No SQLite a visão é TEMP (por conexão) e tem precedência sobre a do banco
+    principal: em shards o catálogo fica em outro arquivo, e com a réplica
+    ativa os bosses vêm da geração em memória corrente.
+    """
+    conn = conectar_usuario()
+    if not eh_sqlite():
+        return conn, {tabela: tabela for tabela in TABELAS_JORNADA}
+
+    catalogo = dict(zip(TABELAS_JORNADA, tabelas_catalogo(conn, *TABELAS_JORNADA)))
+    sql = _SQL_VISAO.format(**catalogo).strip()
+    atual = conn.execute(
+        "SELECT sql FROM sqlite_temp_master WHERE type = 'view' AND name = 'jornada_detalhada'"
+    ).fetchone()
+    if atual is None or atual[0] != sql:
+        conn.execute("DROP VIEW IF EXISTS temp.jornada_detalhada")
+        conn.execute(sql)
+    return conn, catalogo
+
+
+# === Criação ===
+def _ajustar_jornadas(conn, personagem_id=None):
+    """
+    Inclui nas jornadas os bosses que faltam dos pacotes ativos ('Vivo') e refaz o resumo.
+
+    Um DELETE e um INSERT ... SELECT para o personagem informado ou, sem ele,
+    para todos os personagens do banco. Devolve as linhas incluídas.
+    """
+    filtro_jornada = "AND jornada.personagem_id = ?" if personagem_id is not None else ""
+    filtro_pacotes = "AND p.personagem_id = ?" if personagem_id is not None else ""
+    parametros = (int(personagem_id),) if personagem_id is not None else ()
+
+    # Só saem bosses excluídos do catálogo; os de pacotes desativados ficam,
+    # para o progresso voltar quando o pacote for reativado
+    conn.execute(f"""
+        DELETE FROM jornada
+        WHERE NOT EXISTS (SELECT 1 FROM bosses b WHERE b.id = jornada.boss_id) {filtro_jornada}
+    """, parametros)
+    # A chave (personagem_id, boss_id) impede duplicatas
+    incluidas = conn.execute(f"""
+        INSERT INTO jornada (personagem_id, boss_id, status_boss)
+        SELECT p.personagem_id, b.id, 'Vivo'
+        FROM personagem_pacotes p
+        JOIN bosses b ON b.pacote = p.pacote
+        WHERE NOT EXISTS (
+            SELECT 1 FROM jornada j
+            WHERE j.personagem_id = p.personagem_id AND j.boss_id = b.id
+        ) {filtro_pacotes}
+    """, parametros).rowcount
+    _montar_resumo(conn, personagem_id)
+    return incluidas
+
+
+def _montar_resumo(conn, personagem_id=None):
+    """Refaz jornada_resumo a partir da jornada e do catálogo (um personagem ou todos)."""
+    parametros = (int(personagem_id),) if personagem_id is not None else ()
+    conn.execute(
+        f"DELETE FROM jornada_resumo {'WHERE personagem_id = ?' if personagem_id is not None else ''}", parametros
+    )
+    conn.execute(f"""
+        INSERT INTO jornada_resumo (personagem_id, level, level_ord, localidade, status_boss, total, runes)
+        {_SQL_GRUPOS_RESUMO.format(filtro="j.personagem_id = ?" if personagem_id is not None else "true")}
+    """, parametros)
+
+
+def ajustar_jornada(conn, personagem_id):
+    """Ajusta a jornada de um personagem aos seus pacotes ativos (na transação do escritor, banco do usuário)."""
+    return _ajustar_jornadas(conn, personagem_id)
+
+
+def _jornada_em_dia(conn, personagem_id, versao):
+    """
+    A jornada e o resumo já refletem o catálogo: a última sincronização usou esta versão.
+
+    Sem marcador (personagem novo, migração 019, limpar-jornada) ou sem
+    contador de versão (PostgreSQL), a jornada é sempre sincronizada: nenhuma
+    contagem detecta runas ou levels alterados no catálogo.
+    """
+    if versao is None:
+        return False
+    linha = conn.execute(
+        "SELECT versao_catalogo FROM jornada_sincronizacao WHERE personagem_id = ?", (personagem_id,)
+    ).fetchone()
+    return linha is not None and linha[0] == versao
+
+
+def sincronizar_jornada(conn, personagem_id, versao):
+    """Ajusta a jornada do personagem e registra a versão do catálogo usada (na transação do escritor)."""
+    ajustar_jornada(conn, personagem_id)
+    if versao is not None:
+        conn.execute("""
+            INSERT INTO jornada_sincronizacao (personagem_id, versao_catalogo) VALUES (?, ?)
+            ON CONFLICT (personagem_id) DO UPDATE SET versao_catalogo = excluded.versao_catalogo
+        """, (int(personagem_id), versao))
+
+
+def _completar_jornadas(conn, versao):
+    incluidas = _ajustar_jornadas(conn)
+    if versao is not None:
+        # WHERE true: sem ele o SQLite lê o ON CONFLICT como parte do SELECT
+        conn.execute("""
+            INSERT INTO jornada_sincronizacao (personagem_id, versao_catalogo)
+            SELECT id, ? FROM jogadores_personagens WHERE true
+            ON CONFLICT (personagem_id) DO UPDATE SET versao_catalogo = excluded.versao_catalogo
+        """, (versao,))
+    return incluidas
+
+
+def criar_ou_atualizar_jornada(personagem_id):
+    """
+    Sincroniza a jornada do personagem com os bosses dos pacotes ativos (novos entram como 'Vivo').
+
+    Só há trabalho quando o catálogo mudou desde a última sincronização do
+    personagem (contadores `bosses` e `boss_levels` de data_version, que
+    também alimentam o resumo): nas demais seleções do personagem a
+    verificação é uma busca pela chave primária. Sem contador (PostgreSQL),
+    a jornada e o resumo são refeitos a cada seleção.
+    """
+    versao = versao_catalogo_jornada()
+    with conectar_usuario() as conn:
+        if _jornada_em_dia(conn, personagem_id, versao):
+            return
+
+    executar_escrita(sincronizar_jornada, personagem_id, versao, banco=banco_do_usuario())
+
+
+def completar_jornadas():
+    """
+    Backfill de todas as jornadas após o catálogo crescer: os pares (personagem, boss)
+    que faltam entram com uma instrução por banco de usuário. Devolve as linhas incluídas.
+    """
+    versao = versao_catalogo_jornada()
+    return sum(executar_escrita(_completar_jornadas, versao, banco=banco) for banco in bancos_de_usuarios())
+
+
+def _limpar_jornadas(conn):
+    removidas = conn.execute("DELETE FROM jornada").rowcount
+    conn.execute("DELETE FROM jornada_resumo")
+    # Sem marcador, a próxima seleção de cada personagem recria a jornada (e o resumo)
+    conn.execute("DELETE FROM jornada_sincronizacao")
+    return removidas
+
+
+def limpar_jornadas():
+    """Apaga todas as jornadas e seus resumos, em todos os bancos de usuário; devolve as linhas removidas."""
+    return sum(executar_escrita(_limpar_jornadas, banco=banco) for banco in bancos_de_usuarios())
+
+
+# === Consultas do painel ===
+def resumo_jornada(personagem_id):
+    """
+    Linhas de jornada_resumo do personagem: level, level_ord, localidade, status_boss, total e runes.
+
+    Uma leitura pela chave primária, do tamanho do número de grupos (não da
+    jornada): contagens de vivos e mortos, gráficos por level e por
+    localidade e a ordem das localidades saem todos daqui.
+    """
+    with conectar_usuario() as conn:
+        return ler_dataframe("""
+            SELECT NULLIF(level, '') AS level, level_ord, NULLIF(localidade, '') AS localidade,
+                   status_boss, total, runes
+            FROM jornada_resumo
+            WHERE personagem_id = ?
+        """, conn, params=(personagem_id,))
+
+def runas_por_localidade(personagem_id, localidade):
+    """Nome e runas dos bosses de uma localidade da jornada."""
+    conn, _ = _conectar_jornada()
+    with conn:
+        return ler_dataframe("""
+            SELECT nome, runes
+            FROM jornada_detalhada
+            WHERE personagem_id = ? AND localidade = ?
+        """, conn, params=(personagem_id, localidade))
+
+def listar_bosses_vivos(personagem_id, fraco_a=0):
+    """
+    Linhas completas da jornada com os bosses ainda vivos, por ordem de level e runas.
+
+    `fraco_a` é uma máscara de repositorios.bosses.BITS_DANO: com ela, só
+    entram os bosses fracos a pelo menos um dos tipos marcados.
+    """
+    filtro = "AND (fraquezas & ?) <> 0" if fraco_a else ""
+    conn, _ = _conectar_jornada()
+    with conn:
+        return ler_dataframe(f"""
+            SELECT * FROM jornada_detalhada
+            WHERE personagem_id = ? AND status_boss = 'Vivo' {filtro}
+            ORDER BY level_ord IS NULL, level_ord, runes
+        """, conn, params=(personagem_id, fraco_a) if fraco_a else (personagem_id,))
+
+def listar_bosses_vivos_com_level(personagem_id):
+    """Bosses vivos da jornada com o level de boss_levels (formulário de extermínio)."""
+    conn, _ = _conectar_jornada()
+    with conn:
+        return ler_dataframe("""
+            SELECT id, nome, localidade, status_boss, level
+            FROM jornada_detalhada
+            WHERE personagem_id = ? AND status_boss = 'Vivo'
+        """, conn, params=(personagem_id,))
+
+def loot_restante(personagem_id):
+    """Itens que ainda faltam: o loot dos bosses vivos da jornada do personagem."""
+    conn, catalogo = _conectar_jornada()
+    with conn:
+        return ler_dataframe(f"""
+            SELECT l.item, l.quantidade, j.nome, j.localidade, j.level
+            FROM jornada_detalhada j
+            JOIN {catalogo["boss_loot"]} l ON l.boss_id = j.boss_id
+            WHERE j.personagem_id = ? AND j.status_boss = 'Vivo'
+            ORDER BY l.item, j.nome
+        """, conn, params=(personagem_id,))
+
+
+# === Atualização de progresso ===
+def _registrar_mortes(conn, personagem_id, ids_jornada):
+    """Marca as linhas como 'Morto' e move as contagens e runas delas no resumo (na transação do escritor)."""
+    marcadores = ", ".join("?" * len(ids_jornada))
+    filtro = f"j.personagem_id = ? AND j.status_boss <> 'Morto' AND j.id IN ({marcadores})"
+    grupos = conn.execute(
+        _SQL_GRUPOS_RESUMO.format(filtro=filtro), (personagem_id, *ids_jornada)
+    ).fetchall()
+    if not grupos:
+        return
+
+    conn.execute(f"""
+        UPDATE jornada SET status_boss = 'Morto', morto_em = CURRENT_TIMESTAMP
+        WHERE personagem_id = ? AND status_boss <> 'Morto' AND id IN ({marcadores})
+    """, (personagem_id, *ids_jornada))
+
+    conn.executemany("""
+        UPDATE jornada_resumo SET total = total - ?, runes = runes - ?
+        WHERE personagem_id = ? AND level = ? AND localidade = ? AND status_boss = ?
+    """, [(total, runes, pid, level, localidade, status)
+          for pid, level, _, localidade, status, total, runes in grupos])
+    conn.executemany("""
+        INSERT INTO jornada_resumo (personagem_id, level, level_ord, localidade, status_boss, total, runes)
+        VALUES (?, ?, ?, ?, 'Morto', ?, ?)
+        ON CONFLICT (personagem_id, level, localidade, status_boss) DO UPDATE SET
+            total = jornada_resumo.total + excluded.total, runes = jornada_resumo.runes + excluded.runes
+    """, [(pid, level, level_ord, localidade, total, runes)
+          for pid, level, level_ord, localidade, _, total, runes in grupos])
+    conn.execute("DELETE FROM jornada_resumo WHERE personagem_id = ? AND total <= 0", (personagem_id,))
+
+
+def marcar_bosses_mortos(personagem_id, ids_jornada):
+    """Marca como 'Morto' as linhas informadas da jornada do personagem, com a data da morte."""
+    ids_jornada = [int(id_jornada) for id_jornada in ids_jornada]
+    if ids_jornada:
+        executar_escrita(_registrar_mortes, int(personagem_id), ids_jornada, banco=banco_do_usuario())
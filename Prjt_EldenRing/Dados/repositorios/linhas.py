@@ -0,0 +1,40 @@
+from typing import NamedTuple
+
+# === Tipos de linha compactos ===
+# NamedTuples não têm __dict__ por instância e continuam indexáveis como as
+# tuplas que o cursor devolvia (linha[0], linha[1], ...).
+
+
+class Personagem(NamedTuple):
+    id: int
+    nome_jogador: str
+    nome_personagem: str
+
+
+class Build(NamedTuple):
+    vigor: int
+    mind: int
+    endurance: int
+    strength: int
+    dexterity: int
+    intelligence: int
+    faith: int
+    arcane: int
+
+
+class RequisitosArma(NamedTuple):
+    vigor: int
+    mind: int
+    vitality: int
+    strength: int
+    dexterity: int
+    intelligence: int
+    faith: int
+    arcane: int
+
+
+class Pacote(NamedTuple):
+    codigo: str
+    nome: str
+    descricao: str
+    padrao: int
@@ -0,0 +1,44 @@
+from db_catalogo import conectar_catalogo
+from db_escrita import executar_escrita
+from db_shards import banco_do_usuario, conectar_usuario
+from repositorios.jornadas import ajustar_jornada
+from repositorios.linhas import Pacote
+
+# Cada boss pertence a um pacote de conteúdo (bosses.pacote) e cada personagem
+# escolhe os pacotes que joga (personagem_pacotes). A jornada, os gráficos e
+# as contagens só consideram os bosses dos pacotes ativos do personagem.
+
+
+def listar_pacotes():
+    """Pacotes de conteúdo do catálogo, o jogo base primeiro."""
+    with conectar_catalogo() as conn:
+        return [
+            Pacote._make(linha)
+            for linha in conn.execute("SELECT codigo, nome, descricao, padrao FROM pacotes ORDER BY padrao DESC, nome")
+        ]
+
+
+def pacotes_do_personagem(personagem_id):
+    """Códigos dos pacotes ativos do personagem."""
+    with conectar_usuario() as conn:
+        return [
+            linha[0]
+            for linha in conn.execute(
+                "SELECT pacote FROM personagem_pacotes WHERE personagem_id = ? ORDER BY pacote", (personagem_id,)
+            )
+        ]
+
+
+def definir_pacotes(personagem_id, codigos):
+    """Troca os pacotes ativos do personagem e ajusta a jornada na mesma transação."""
+    personagem_id = int(personagem_id)
+
+    def _gravar(conn):
+        conn.execute("DELETE FROM personagem_pacotes WHERE personagem_id = ?", (personagem_id,))
+        conn.executemany(
+            "INSERT INTO personagem_pacotes (personagem_id, pacote) VALUES (?, ?)",
+            [(personagem_id, codigo) for codigo in dict.fromkeys(codigos)],
+        )
+        ajustar_jornada(conn, personagem_id)
+
+    executar_escrita(_gravar, banco=banco_do_usuario())
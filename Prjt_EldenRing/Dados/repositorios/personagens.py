@@ -1,76 +1,57 @@
-import sqlite3
-import os
+from db_escrita import escrever, executar_escrita
+from db_shards import banco_do_usuario, conectar_usuario
+from db_versoes import versao_catalogo_jornada
+from repositorios.jornadas import sincronizar_jornada
+from repositorios.linhas import Personagem
 
-# Caminho do banco de dados
-DB_PATH = os.path.join(os.path.dirname(__file__), "dados.db")
-
-def criar_tabela():
-    """
-    Cria a tabela jogadores_personagens, se não existir, com controle por nome de usuário.
-    """
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jogadores_personagens (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome_jogador TEXT NOT NULL,
-                nome_personagem TEXT NOT NULL,
-                nome_usuario_criador TEXT NOT NULL
-            )
-        """)
-        # Adiciona a coluna nome_usuario_criador caso não exista (evita falhas em bancos antigos)
-        try:
-            cursor.execute("ALTER TABLE jogadores_personagens ADD COLUMN nome_usuario_criador TEXT")
-            conn.commit()
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" not in str(e):
-                print(f"Erro ao adicionar coluna 'nome_usuario_criador': {e}")
-
-# Inserir novo jogador
+# Inserir novo jogador (já com os pacotes de conteúdo padrão ativos e a jornada criada)
 def inserir_jogador(nome_jogador, nome_personagem, nome_usuario_criador):
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
+    versao = versao_catalogo_jornada()
+
+    def _gravar(conn):
+        personagem_id = conn.execute("""
             INSERT INTO jogadores_personagens (nome_jogador, nome_personagem, nome_usuario_criador)
             VALUES (?, ?, ?)
-        """, (nome_jogador, nome_personagem, nome_usuario_criador))
-        conn.commit()
+            RETURNING id
+        """, (nome_jogador, nome_personagem, nome_usuario_criador)).fetchone()[0]
+        conn.execute("""
+            INSERT INTO personagem_pacotes (personagem_id, pacote)
+            SELECT ?, codigo FROM pacotes WHERE padrao = 1
+        """, (personagem_id,))
+        # Jornada na mesma transação: um INSERT ... SELECT a partir do catálogo
+        sincronizar_jornada(conn, personagem_id, versao)
+
+    executar_escrita(_gravar, banco=banco_do_usuario(nome_usuario_criador))
 
 # Listar jogadores apenas do usuário logado
 def listar_jogadores(nome_usuario_criador):
-    with sqlite3.connect(DB_PATH) as conn:
+    with conectar_usuario(nome_usuario_criador) as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT id, nome_jogador, nome_personagem 
             FROM jogadores_personagens 
             WHERE nome_usuario_criador = ?
         """, (nome_usuario_criador,))
-        return cursor.fetchall()
+        return [Personagem._make(linha) for linha in cursor.fetchall()]
 
 # Atualizar jogador
 def atualizar_jogador(id_jogador, novo_nome, novo_personagem, nome_usuario_criador):
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE jogadores_personagens
-            SET nome_jogador = ?, nome_personagem = ?
-            WHERE id = ? AND nome_usuario_criador = ?
-        """, (novo_nome, novo_personagem, id_jogador, nome_usuario_criador))
-        conn.commit()
+    escrever("""
+        UPDATE jogadores_personagens
+        SET nome_jogador = ?, nome_personagem = ?
+        WHERE id = ? AND nome_usuario_criador = ?
+    """, (novo_nome, novo_personagem, id_jogador, nome_usuario_criador), banco=banco_do_usuario(nome_usuario_criador))
 
 # Excluir jogador
 def excluir_jogador(id_jogador, nome_usuario_criador):
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            DELETE FROM jogadores_personagens 
-            WHERE id = ? AND nome_usuario_criador = ?
-        """, (id_jogador, nome_usuario_criador))
-        conn.commit()
+    escrever("""
+        DELETE FROM jogadores_personagens 
+        WHERE id = ? AND nome_usuario_criador = ?
+    """, (id_jogador, nome_usuario_criador), banco=banco_do_usuario(nome_usuario_criador))
 
 # Obter personagens únicos do usuário
 def obter_personagens(nome_usuario_criador):
-    with sqlite3.connect(DB_PATH) as conn:
+    with conectar_usuario(nome_usuario_criador) as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT DISTINCT nome_personagem 
@@ -82,7 +63,8 @@ def obter_personagens(nome_usuario_criador):
 
 # Testes locais
 if __name__ == "__main__":
-    criar_tabela()
+    from db_bootstrap import inicializar_banco
+    inicializar_banco(segundo_plano=False)
 
     # Cadastro de jogadores para testes
     inserir_jogador("PlayerOne", "Warrior", "teste_user")
@@ -1,42 +1,22 @@
-# db_seguranca.py
-import sqlite3
-import os
+# === Repositório de usuários: login, cadastro e permissões ===
 import hashlib
 
-# Caminho do banco de dados
-DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados.db")
-
-# === Criação da Tabela ===
-def criar_tabela_usuarios():
-    """Cria a tabela de usuários no banco de dados se não existir."""
-    try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_jogador (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nome_completo TEXT NOT NULL,
-                    nome_usuario TEXT NOT NULL UNIQUE,
-                    senha TEXT NOT NULL,  -- Usar senha_hash se implementar hashing
-                    permissao TEXT NOT NULL DEFAULT 'USER'
-                )
-            """)
-            conn.commit()
-    except sqlite3.Error as e:
-        print(f"[ERRO] criar_tabela_usuarios: {e}")
+from db_backend import ERROS_BANCO, ERROS_INTEGRIDADE
+from db_conexao import conectar
+from db_escrita import escrever
 
 # === Obter nome completo pelo login ===
 def obter_nome_completo_do_usuario(nome_usuario_login):
     """Obtém o nome completo do usuário pelo nome de usuário (login)."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with conectar() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT nome_completo FROM user_jogador WHERE nome_usuario = ?
             """, (nome_usuario_login,))
             resultado = cursor.fetchone()
             return resultado[0] if resultado else None
-    except sqlite3.Error as e:
+    except ERROS_BANCO as e:
         print(f"[ERRO] obter_nome_completo_do_usuario: {e}")
         return None
 
@@ -44,14 +24,14 @@ def obter_nome_completo_do_usuario(nome_usuario_login):
 def obter_permissao_do_usuario(nome_usuario_login):
     """Obtém a permissão do usuário pelo nome de usuário (login)."""
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with conectar() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT permissao FROM user_jogador WHERE nome_usuario = ?
             """, (nome_usuario_login,))
             resultado = cursor.fetchone()
             return resultado[0] if resultado else None
-    except sqlite3.Error as e:
+    except ERROS_BANCO as e:
         print(f"[ERRO] obter_permissao_do_usuario: {e}")
         return None
 
@@ -62,7 +42,7 @@ def autenticar_usuario(nome_usuario, senha):
     Se desejar, substitua a verificação da senha simples para a versão com hashing.
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
+        with conectar() as conn:
             cursor = conn.cursor()
             # Primeiro, tenta buscar a senha sem hashing
             cursor.execute("""
@@ -81,15 +61,14 @@ def autenticar_usuario(nome_usuario, senha):
                     if senha_armazenada == senha:
                         # Atualiza a senha para o formato hash
                         senha_hash = hashlib.sha256(senha.encode()).hexdigest()
-                        cursor.execute("""
+                        escrever("""
                             UPDATE user_jogador
                             SET senha = ?
                             WHERE nome_usuario = ?
                         """, (senha_hash, nome_usuario))
-                        conn.commit()
                         return nome_completo
             return None
-    except sqlite3.Error as e:
+    except ERROS_BANCO as e:
         print(f"[ERRO] autenticar_usuario: {e}")
         return None
 
@@ -100,17 +79,14 @@ def cadastrar_usuario(nome_completo, nome_usuario, senha):
     Se for usar senha com hash, substitua a lógica de senha simples.
     """
     try:
-        with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            # Para senha com hash (recomendado):
-            senha_hash = hashlib.sha256(senha.encode()).hexdigest()  # Hash da senha para segurança
-            cursor.execute("""
-                INSERT INTO user_jogador (nome_completo, nome_usuario, senha)
-                VALUES (?, ?, ?)
-            """, (nome_completo, nome_usuario, senha_hash))  # Inserir com senha hash
-            conn.commit()
-            return True, "Usuário cadastrado com sucesso!"
-    except sqlite3.IntegrityError:
+        # Para senha com hash (recomendado):
+        senha_hash = hashlib.sha256(senha.encode()).hexdigest()  # Hash da senha para segurança
+        escrever("""
+            INSERT INTO user_jogador (nome_completo, nome_usuario, senha)
+            VALUES (?, ?, ?)
+        """, (nome_completo, nome_usuario, senha_hash))  # Inserir com senha hash
+        return True, "Usuário cadastrado com sucesso!"
+    except ERROS_INTEGRIDADE:
         return False, "❌ Nome de usuário já existe."
     except Exception as e:
         return False, f"❌ Erro ao cadastrar: {str(e)}"
@@ -0,0 +1,60 @@
+import pandas as pd
+from pathlib import Path
+
+from db_backend import ler_dataframe
+from db_catalogo import conectar_catalogo
+from repositorios.linhas import RequisitosArma
+
+# === Caminhos relativos ===
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSV_PATH = BASE_DIR / "elden_ring_weapon.csv"
+
+ATRIBUTOS = list(RequisitosArma._fields)
+
+# === Preparação do CSV (usada por db_importacao) ===
+def preparar_weapons(df):
+    """Converte um bloco de elden_ring_weapon.csv nas colunas de weapons (mais o tipo da linha)."""
+    df.columns = ["tipo", "name"] + ATRIBUTOS
+    df["name"] = df["name"].str.strip()
+    df["tipo"] = df["tipo"].str.strip()
+    df[ATRIBUTOS] = df[ATRIBUTOS].apply(pd.to_numeric, errors="coerce").fillna(0).astype(int)
+    return df
+
+def gravar_tipos_weapons(conn, df):
+    """Associa cada arma do bloco ao tipo da linha do CSV em weapon_tipos (sem repetir pares)."""
+    conn.executemany("""
+        INSERT INTO weapon_tipos (weapon_id, tipo)
+        SELECT id, ? FROM weapons WHERE name = ?
+        ON CONFLICT (weapon_id, tipo) DO NOTHING
+    """, list(df[["tipo", "name"]].dropna().drop_duplicates().itertuples(index=False, name=None)))
+
+# === Consultas ===
+def listar_nomes_weapons():
+    """Nomes das armas em ordem alfabética (opções dos slots)."""
+    with conectar_catalogo() as conn:
+        return [linha[0] for linha in conn.execute("SELECT name FROM weapons ORDER BY name")]
+
+def obter_requisitos_weapon(nome):
+    """Requisitos da arma (busca pelo nome único) ou None se não existir."""
+    with conectar_catalogo() as conn:
+        linha = conn.execute(
+            f"SELECT {', '.join(ATRIBUTOS)} FROM weapons WHERE name = ?", (nome,)
+        ).fetchone()
+        return RequisitosArma._make(linha) if linha else None
+
+def listar_tipos_weapons():
+    """Tipos de arma cadastrados em weapon_tipos."""
+    with conectar_catalogo() as conn:
+        return [linha[0] for linha in conn.execute("SELECT DISTINCT tipo FROM weapon_tipos ORDER BY tipo")]
+
+def obter_weapons(tipo=None):
+    """DataFrame com as armas e seus requisitos, uma linha por tipo (todas ou só as do tipo)."""
+    filtro = "WHERE t.tipo = ?" if tipo else ""
+    with conectar_catalogo() as conn:
+        return ler_dataframe(f"""
+            SELECT w.name, t.tipo AS type, {', '.join(f'w.{a}' for a in ATRIBUTOS)}
+            FROM weapons w
+            LEFT JOIN weapon_tipos t ON t.weapon_id = w.id
+            {filtro}
+            ORDER BY w.name, t.tipo
+        """, conn, params=(tipo,) if tipo else None)
@@ -27,16 +27,16 @@ if str(caminho_dados) not in sys.path:
     sys.path.append(str(caminho_dados))
 
 # === Importações de banco ===
-from db import (
-    criar_tabela,
+from db_bootstrap import inicializar_banco
+from repositorios.personagens import (
     inserir_jogador,
     listar_jogadores,
     atualizar_jogador,
     excluir_jogador
 )
 
-# === Inicializa banco de dados se necessário ===
-criar_tabela()
+# === Garante o banco inicializado (sem custo após a primeira execução) ===
+inicializar_banco()
 
 # === Configuração da Página ===
 st.set_page_config(page_title="Elden Ring - Home", layout="wide")
@@ -17,16 +17,21 @@ if not st.session_state['autenticado']:
     st.stop() # Interrompe a execução do resto do script da página
 # --- Fim da Lógica de Controle de Acesso ---
 
-# === Adiciona caminho do módulo db_boss.py ===
+# === Adiciona caminho da pasta Dados (repositórios) ===
 caminho_atual = Path(__file__).resolve().parent
 CAMINHO_DADOS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Dados'))
 if CAMINHO_DADOS not in sys.path:
     sys.path.append(CAMINHO_DADOS)
 
-from db_boss import criar_tabela_boss, listar_bosses, atualizar_boss
+from db_bootstrap import inicializar_banco
+from repositorios.bosses import (
+    TIPOS_DANO, listar_bosses, atualizar_boss, bosses_que_dropam, listar_itens_loot, mascara_de_tipos
+)
+from repositorios.jornadas import loot_restante
+from repositorios.personagens import listar_jogadores
 
-# === Inicializa banco e tabela ===
-criar_tabela_boss()
+# === Garante o banco inicializado (sem custo após a primeira execução) ===
+inicializar_banco()
 
 # === Configuração da Página ===
 st.set_page_config(page_title="Elden Ring - Home", layout="wide")
@@ -86,19 +91,27 @@ try:
             nome_boss = c1.text_input("🔎 Buscar por nome do Boss").strip().lower()
             localidades = ["Todas"] + sorted(df["Localidade"].dropna().unique())
             localidade_escolhida = c2.selectbox("📍 Escolha a Localidade", localidades)
+            c3, c4 = st.columns(2)
+            fraco_a = mascara_de_tipos(c3.multiselect("⚔️ Fraco a (qualquer um)", list(TIPOS_DANO)))
+            resiste_a = mascara_de_tipos(c4.multiselect("🛡️ Sem resistência a (nenhum deles)", list(TIPOS_DANO)))
 
         df_filtrado = df.copy()
         if nome_boss:
             df_filtrado = df_filtrado[df_filtrado["Nome"].str.lower().str.contains(nome_boss)]
         if localidade_escolhida != "Todas":
             df_filtrado = df_filtrado[df_filtrado["Localidade"] == localidade_escolhida]
+        # Máscaras de bits: um E bit a bit na coluna inteira, sem buscar texto
+        if fraco_a:
+            df_filtrado = df_filtrado[(df_filtrado["fraquezas"].fillna(0).astype("int64") & fraco_a) != 0]
+        if resiste_a:
+            df_filtrado = df_filtrado[(df_filtrado["resistencias"].fillna(0).astype("int64") & resiste_a) == 0]
 
         # === Resultado dos Filtros ===
         st.subheader("📋 Resultado dos Filtros")
         if df_filtrado.empty:
             st.warning("Nenhum boss encontrado com os critérios selecionados.")
         else:
-            st.dataframe(df_filtrado.drop(columns=["ID"]), use_container_width=True)
+            st.dataframe(df_filtrado.drop(columns=["ID", "fraquezas", "resistencias"]), use_container_width=True)
 
             if len(df_filtrado) == 1:
                 boss = df_filtrado.iloc[0]
@@ -160,9 +173,38 @@ try:
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
 
+# === Busca por loot ===
+st.subheader("🎁 Busca por Loot")
+try:
+    aba_item, aba_restante = st.tabs(["🔎 Quem dropa o item", "🧭 Loot restante do personagem"])
+
+    with aba_item:
+        itens = listar_itens_loot()
+        if not itens:
+            st.info("Nenhum loot cadastrado.")
+        else:
+            item_escolhido = st.selectbox("🎁 Escolha o item", itens)
+            st.dataframe(bosses_que_dropam(item_escolhido), use_container_width=True, hide_index=True)
+
+    with aba_restante:
+        nome_usuario_logado = st.session_state.get("usuario_logado")
+        personagens = {p.id: p.nome_personagem for p in listar_jogadores(nome_usuario_logado)} if nome_usuario_logado else {}
+        if not personagens:
+            st.info("Nenhum personagem cadastrado.")
+        else:
+            personagem_id = st.selectbox("🎮 Escolha seu personagem", list(personagens), format_func=personagens.get)
+            df_loot = loot_restante(personagem_id)
+            if df_loot.empty:
+                st.info("Nenhum loot pendente: todos os bosses da jornada foram derrotados (ou a jornada ainda não foi iniciada).")
+            else:
+                st.caption(f"{df_loot['item'].nunique()} item(ns) ainda a obter de {df_loot['nome'].nunique()} boss(es) vivo(s).")
+                st.dataframe(df_loot, use_container_width=True, hide_index=True)
+except Exception as e:
+    st.error(f"Erro ao buscar o loot: {e}")
+
 # === Tabela completa ===
 st.subheader("📊 Visualização Completa da Tabela de Bosses")
 try:
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.dataframe(df.drop(columns=["fraquezas", "resistencias"]), use_container_width=True, hide_index=True)
 except Exception as e:
     st.error(f"Erro ao exibir a visualização: {e}")
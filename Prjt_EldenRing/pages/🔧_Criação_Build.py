@@ -12,15 +12,21 @@ if not st.session_state['autenticado']:
     st.stop()
 
 # --- Imports dos Módulos ---
-from db_build import (
-    criar_tabela_build,
+from db_bootstrap import inicializar_banco
+from repositorios.builds import (
     inicializar_build_para_personagem,
     obter_build,
-    atualizar_build
+    atualizar_build,
+    salvar_build_weapon,
+    carregar_build_weapon
+)
+from repositorios.personagens import listar_jogadores
+from repositorios.weapons import (
+    listar_nomes_weapons,
+    listar_tipos_weapons,
+    obter_requisitos_weapon,
+    obter_weapons
 )
-from db import obter_personagens
-from db_weapon import criar_tabela_weapons, obter_weapons
-from db_build_weapon import criar_tabela_build_weapon, salvar_build_weapon, carregar_build_weapon
 
 # --- Configurações Iniciais ---
 st.set_page_config(page_title="🔧 Build do Personagem", layout="wide")
@@ -67,20 +73,19 @@ o importante é explorar ao máximo as possibilidades e curtir cada batalha com
 ⚠ Primeiro registre-se como Jogador e Personagem na página 🎮 Gestão Personagem.
 ''')
 
-# --- Inicialização das Tabelas ---
-criar_tabela_build()
-criar_tabela_weapons()
-criar_tabela_build_weapon()
+# --- Garante o banco inicializado (sem custo após a primeira execução) ---
+inicializar_banco()
 
 # --- Seleção do Personagem ---
-personagens = obter_personagens(st.session_state['usuario_logado'])
+personagens = {p.id: p.nome_personagem for p in listar_jogadores(st.session_state['usuario_logado'])}
 
-personagem_escolhido = st.selectbox("Escolha um personagem:", personagens)
+personagem_id = st.selectbox("Escolha um personagem:", list(personagens), format_func=personagens.get)
+personagem_escolhido = personagens.get(personagem_id)
 
 if personagem_escolhido:
-    inicializar_build_para_personagem(personagem_escolhido)
-    valores = obter_build(personagem_escolhido)
-    df_carregada = carregar_build_weapon(personagem_escolhido)
+    inicializar_build_para_personagem(personagem_id)
+    valores = obter_build(personagem_id)
+    df_carregada = carregar_build_weapon(personagem_id)
 
     if valores:
         # --- Formulário de Atributos ---
@@ -100,7 +105,7 @@ if personagem_escolhido:
                 arcane = st.number_input("Arcane", 0, 99, valores[7])
 
             if st.form_submit_button("💾 Salvar Build"):
-                atualizar_build(personagem_escolhido, {
+                atualizar_build(personagem_id, {
                     "vigor": vigor, "mind": mind, "endurance": endurance,
                     "strength": strength, "dexterity": dexterity,
                     "intelligence": intelligence, "faith": faith, "arcane": arcane
@@ -117,9 +122,8 @@ if personagem_escolhido:
         st.dataframe(build_df, use_container_width=True)
 
         # --- Slots de Armas ---
-        df_weapons = obter_weapons()
         st.subheader("🎯 Escolha suas Armas/Slots")
-        weapon_options = df_weapons["name"].dropna().unique().tolist()
+        weapon_options = listar_nomes_weapons()
 
         armas_pre_selecionadas = [""] * 10
         if not df_carregada.empty:
@@ -149,11 +153,8 @@ if personagem_escolhido:
 
         dfs_arma = []
         for nome in armas_escolhidas:
-            if nome:
-                linha = df_weapons[df_weapons["name"] == nome][colunas_status]
-                dfs_arma.append(linha.iloc[0].tolist())
-            else:
-                dfs_arma.append([0] * len(colunas_status))
+            requisitos = obter_requisitos_weapon(nome) if nome else None
+            dfs_arma.append(list(requisitos) if requisitos else [0] * len(colunas_status))
 
         df_resultado = pd.DataFrame(dfs_arma, columns=colunas_status).T
         df_resultado.columns = [f"Slot {i+1}" for i in range(len(armas_escolhidas))]
@@ -189,22 +190,21 @@ if personagem_escolhido:
                 slot_num = i + 1
                 for idx, row in df_resultado.iterrows():
                     registros.append({
-                        "personagem": personagem_escolhido,
                         "Status": row["Status"],
                         "Slot": slot_num,
                         "Item": arma or f"Slot {slot_num}",
                         "Valor": int(row.get(f"Slot {slot_num}", 0) or 0)
                     })
             df_vertical = pd.DataFrame(registros)
-            salvar_build_weapon(personagem_escolhido, df_vertical)
+            salvar_build_weapon(personagem_id, df_vertical)
             st.success("Armas atribuídas à build com sucesso!")
 
         # --- Base de Armas ---
         st.subheader("🗁️ Base de Armas Disponíveis")
-        tipos_disponiveis = df_weapons["type"].dropna().unique().tolist()
+        tipos_disponiveis = listar_tipos_weapons()
         tipo_selecionado = st.selectbox("Filtrar por tipo de arma:", ["Todos"] + tipos_disponiveis)
 
-        df_filtrado = df_weapons if tipo_selecionado == "Todos" else df_weapons[df_weapons["type"] == tipo_selecionado]
+        df_filtrado = obter_weapons(None if tipo_selecionado == "Todos" else tipo_selecionado)
         st.dataframe(
             df_filtrado[["name", "type", "vigor", "mind", "vitality", "strength", "dexterity", "intelligence", "faith", "arcane"]],
             use_container_width=True
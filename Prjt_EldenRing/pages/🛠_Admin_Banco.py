@@ -0,0 +1,122 @@
+import os
+import sys
+import base64
+from pathlib import Path
+
+import streamlit as st
+
+# --- Início da Lógica de Controle de Acesso ---
+if 'autenticado' not in st.session_state:
+    st.session_state['autenticado'] = False
+
+if not st.session_state['autenticado']:
+    st.warning("⚠️ Você precisa fazer login para acessar esta página.")
+    st.info("Por favor, retorne à página inicial para fazer login.")
+    st.stop()
+# --- Fim da Lógica de Controle de Acesso ---
+
+# === Adiciona caminho da pasta Dados ===
+caminho_atual = Path(__file__).resolve().parent
+CAMINHO_DADOS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Dados'))
+if CAMINHO_DADOS not in sys.path:
+    sys.path.append(CAMINHO_DADOS)
+
+from db_backend import eh_sqlite
+from db_bootstrap import inicializar_banco
+from db_diagnostico import consultas_lentas, resumo_arquivo, tamanho_tabelas, uso_indices
+from db_escrita import estatisticas_escrita
+from db_manutencao import bancos, executar_manutencao, formatar_relatorio, historico_manutencao
+from repositorios.usuarios import obter_permissao_do_usuario
+
+inicializar_banco()
+
+# === Apenas administradores ===
+if obter_permissao_do_usuario(st.session_state.get('usuario_logado')) != 'ADMIN':
+    st.error("⛔ Página restrita a administradores.")
+    st.stop()
+
+st.set_page_config(page_title="Elden Ring - Admin do Banco", layout="wide")
+
+# === Fundo ===
+def set_bg_from_local(relative_path):
+    image_file = caminho_atual / relative_path
+    if image_file.exists():
+        with open(image_file, "rb") as file:
+            encoded = base64.b64encode(file.read()).decode()
+        st.markdown(f"""
+        <style>
+        .stApp {{
+            background-image:
+                linear-gradient(rgba(0, 0, 0, 0.85), rgba(0, 0, 0, 0.85)),
+                url("data:image/jpg;base64,{encoded}");
+            background-size: cover;
+            background-position: center;
+            background-repeat: no-repeat;
+        }}
+        </style>
+        """, unsafe_allow_html=True)
+
+set_bg_from_local("../assets/home_background.jpg")
+
+st.title("🛠 Saúde do Banco de Dados")
+
+if not eh_sqlite():
+    st.info("O diagnóstico usa recursos do SQLite (dbstat, PRAGMAs); use as ferramentas do servidor PostgreSQL.")
+    st.stop()
+
+
+def formatar_bytes(valor):
+    for unidade in ["B", "KiB", "MiB", "GiB"]:
+        if valor < 1024 or unidade == "GiB":
+            return f"{valor:,.0f} {unidade}" if unidade == "B" else f"{valor:,.1f} {unidade}"
+        valor /= 1024
+
+
+# === Escolha do banco (principal ou shard) ===
+arquivos = {Path(caminho).name: caminho for caminho in bancos()}
+banco_escolhido = st.selectbox("🗄️ Banco", list(arquivos))
+caminho = arquivos[banco_escolhido]
+
+# === Arquivo ===
+resumo = resumo_arquivo(caminho)
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("📦 Arquivo", formatar_bytes(resumo.tamanho_bytes))
+c2.metric("📝 WAL", formatar_bytes(resumo.wal_bytes))
+c3.metric("🕳️ Páginas livres", f"{resumo.paginas_livres} ({formatar_bytes(resumo.bytes_livres)})")
+c4.metric("📊 Último ANALYZE", resumo.ultimo_analyze or "sem registro")
+
+# === Tabelas ===
+st.subheader("📋 Tabelas")
+tabelas = tamanho_tabelas(caminho)
+st.dataframe(tabelas, use_container_width=True, hide_index=True)
+st.bar_chart(tabelas.set_index("tabela")[["bytes_dados", "bytes_indices"]])
+
+# === Índices ===
+st.subheader("🔎 Índices")
+st.caption("Uso estimado pelo plano atual (EXPLAIN QUERY PLAN) das consultas registradas neste processo.")
+st.dataframe(uso_indices(caminho), use_container_width=True, hide_index=True)
+
+# === Consultas ===
+st.subheader("🐢 Consultas mais lentas (tempo médio)")
+st.dataframe(
+    consultas_lentas(20).round({"total_ms": 2, "media_ms": 2, "maior_ms": 2}),
+    use_container_width=True,
+    hide_index=True,
+)
+
+# === Escritor ===
+st.subheader("✍️ Escritor em segundo plano")
+escrita = estatisticas_escrita()
+e1, e2, e3, e4 = st.columns(4)
+e1.metric("Fila", escrita.profundidade_fila)
+e2.metric("Operações / falhas", f"{escrita.operacoes} / {escrita.falhas}")
+e3.metric("Commits (maior lote)", f"{escrita.commits} ({escrita.maior_lote})")
+e4.metric("Latência média do commit", f"{escrita.media_latencia_ms:.1f} ms")
+
+# === Manutenção ===
+st.subheader("🧰 Manutenção")
+st.dataframe(historico_manutencao(20), use_container_width=True, hide_index=True)
+
+if st.button("▶️ Executar manutenção agora"):
+    with st.spinner("Executando backup, otimização, vácuo e checkpoint..."):
+        st.code(formatar_relatorio(executar_manutencao()))
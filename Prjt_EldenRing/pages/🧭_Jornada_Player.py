@@ -1,6 +1,5 @@
 import os
 import sys
-import sqlite3
 import base64
 from pathlib import Path
 
@@ -30,112 +29,24 @@ if not st.session_state['autenticado']:
 # === Caminhos ===
 BASE_DIR = os.path.dirname(__file__)
 DADOS_PATH = os.path.abspath(os.path.join(BASE_DIR, '..', 'Dados'))
-DB_PATH = os.path.join(DADOS_PATH, 'dados.db')
 
 # Garante que a pasta Dados seja visível para importações
 sys.path.append(DADOS_PATH)
-from db_boss_lvl import criar_tabela_boss_lvl, listar_boss_levels
-
-# === Inicializa a tabela boss_levels ===
-criar_tabela_boss_lvl()
-
-# === Funções auxiliares ===
-def sincronizar_jornada_com_bosses():
-    with sqlite3.connect(DB_PATH) as conn:
-        jornada = pd.read_sql_query("SELECT * FROM jornada", conn)
-        bosses = pd.read_sql_query("SELECT * FROM bosses", conn)
-
-    # Criar chave única para identificar cada boss
-    jornada["chave"] = (jornada["localidade"].str.strip() + jornada["nome"].str.strip()).str.lower()
-    bosses["chave"] = (bosses["localidade"].str.strip() + bosses["nome"].str.strip()).str.lower()
-
-    # Mesclar mantendo o id da jornada e os campos que não serão sobrescritos
-    atualizada = pd.merge(
-        jornada[["id", "chave", "personagem", "status_boss"]],
-        bosses.drop(columns=["id"]),
-        on="chave",
-        how="left",
-        suffixes=("", "_boss")
-    )
-
-    # Reorganizar as colunas
-    atualizada = atualizada[[
-        "id", "personagem", "nome", "localidade", "location",
-        "runes", "loot", "stance", "tipo_dano_pref", "resistencia", "status_boss"
-    ]]
-
-    # Atualizar os registros na tabela jornada
-    with sqlite3.connect(DB_PATH) as conn:
-        for _, row in atualizada.iterrows():
-            conn.execute("""
-                UPDATE jornada
-                SET nome = ?, localidade = ?, location = ?, runes = ?, loot = ?,
-                    stance = ?, tipo_dano_pref = ?, resistencia = ?
-                WHERE id = ?
-            """, (
-                row["nome"], row["localidade"], row["location"], row["runes"],
-                row["loot"], row["stance"], row["tipo_dano_pref"],
-                row["resistencia"], row["id"]
-            ))
-        conn.commit()
-
-def obter_jogadores(nome_usuario_logado):
-    """Obtém os jogadores (personagens) associados ao usuário logado filtrado por nome_usuario."""
-    with sqlite3.connect(DB_PATH) as conn:
-        # Realiza a junção entre as tabelas 'user_jogador' e 'jogadores_personagens'
-        query = """
-            SELECT jp.id, jp.nome_jogador, jp.nome_personagem
-            FROM jogadores_personagens jp
-            JOIN user_jogador uj ON jp.nome_usuario_criador = uj.nome_usuario
-            WHERE uj.nome_usuario = ?
-        """
-        # Retorna os jogadores filtrados pelo nome_usuario_logado
-        return pd.read_sql_query(query, conn, params=(nome_usuario_logado,))
-
-
-def obter_bosses_com_level():
-    with sqlite3.connect(DB_PATH) as conn:
-        bosses = pd.read_sql_query("SELECT * FROM bosses", conn)
-        levels = pd.read_sql_query("SELECT * FROM boss_levels", conn)
-
-    bosses["chave"] = (bosses["localidade"].str.strip() + bosses["nome"].str.strip()).str.lower()
-    levels["chave"] = (levels["localidade"].str.strip() + levels["nome"].str.strip()).str.lower()
-
-    merged = pd.merge(bosses, levels[["chave", "level"]], on="chave", how="left")
-    return merged.drop(columns=["chave"])
-
-def criar_ou_atualizar_jornada(nome_personagem, df_bosses):
-    df_bosses["personagem"] = nome_personagem
-    df_bosses["status_boss"] = "Vivo"
-
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jornada (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                personagem TEXT,
-                nome TEXT,
-                localidade TEXT,
-                location TEXT,
-                runes INTEGER,
-                loot TEXT,
-                stance TEXT,
-                tipo_dano_pref TEXT,
-                resistencia TEXT,
-                level TEXT,
-                status_boss TEXT
-            )
-        """)
-        cursor.execute("SELECT COUNT(*) FROM jornada WHERE personagem = ?", (nome_personagem,))
-        registros = cursor.fetchone()[0]
-
-        if registros == 0:
-            df_bosses.drop(columns=["id"], errors="ignore").to_sql("jornada", conn, if_exists="append", index=False)
-
-def obter_total_bosses_distintos():
-    with sqlite3.connect(DB_PATH) as conn:
-        df = pd.read_sql_query("SELECT DISTINCT localidade || nome AS chave FROM bosses", conn)
-        return df["chave"].nunique()
+from db_bootstrap import inicializar_banco
+from repositorios.bosses import TIPOS_DANO, mascara_de_tipos
+from repositorios.jornadas import (
+    criar_ou_atualizar_jornada,
+    listar_bosses_vivos,
+    listar_bosses_vivos_com_level,
+    marcar_bosses_mortos,
+    resumo_jornada,
+    runas_por_localidade
+)
+from repositorios.pacotes import definir_pacotes, listar_pacotes, pacotes_do_personagem
+from repositorios.personagens import listar_jogadores
+
+# === Garante o banco inicializado (sem custo após a primeira execução) ===
+inicializar_banco()
 
 # === Fundo ===
 
@@ -185,51 +96,50 @@ if nome_usuario_logado is None:
     st.warning("⚠️ Usuário não logado. Por favor, faça login para acessar a jornada.")
     st.stop()
 
-# Chama a função para obter os jogadores do usuário logado
-jogadores_df = obter_jogadores(nome_usuario_logado)
-personagens = jogadores_df["nome_personagem"].tolist()
+# Chama a função para obter os jogadores do usuário logado (id -> nome do personagem)
+personagens = {p.id: p.nome_personagem for p in listar_jogadores(nome_usuario_logado)}
 
 if not personagens:
     st.warning("Nenhum personagem cadastrado.")
 else:
-    personagem_escolhido = st.selectbox("🎮 Escolha seu personagem", personagens)
+    personagem_id = st.selectbox("🎮 Escolha seu personagem", list(personagens), format_func=personagens.get)
+    personagem_escolhido = personagens.get(personagem_id)
 
     if personagem_escolhido:
-        sincronizar_jornada_com_bosses()
-        df_bosses_lvl = obter_bosses_com_level()
-        criar_ou_atualizar_jornada(personagem_escolhido, df_bosses_lvl)
+        # === Pacotes de conteúdo do personagem ===
+        pacotes = {p.codigo: p.nome for p in listar_pacotes()}
+        pacotes_ativos = pacotes_do_personagem(personagem_id)
+        with st.expander("🧩 Conteúdo jogado por este personagem"):
+            escolhidos = st.multiselect(
+                "Pacotes ativos", list(pacotes), default=pacotes_ativos, format_func=pacotes.get,
+                key=f"pacotes_{personagem_id}"
+            )
+            st.caption("Desativar um pacote esconde os bosses dele da jornada; o progresso volta ao reativá-lo.")
+            if st.button("💾 Salvar pacotes") and set(escolhidos) != set(pacotes_ativos):
+                definir_pacotes(personagem_id, escolhidos)
+                st.rerun()
+
+        criar_ou_atualizar_jornada(personagem_id)
         st.success(f"Jornada ativa para: {personagem_escolhido}")
 
+        # === Resumo da jornada (uma leitura; métricas e gráficos saem dele) ===
+        df_resumo = resumo_jornada(personagem_id)
+        por_status = df_resumo.groupby("status_boss")["total"].sum()
+        vivos, mortos = int(por_status.get("Vivo", 0)), int(por_status.get("Morto", 0))
+
         # === Métricas ===
         col1, col2, col3 = st.columns(3)
-        col1.metric("👹 Total de Bosses Únicos", obter_total_bosses_distintos())
-
-        with sqlite3.connect(DB_PATH) as conn:
-            vivos = pd.read_sql_query(
-                "SELECT COUNT(*) as total FROM jornada WHERE personagem = ? AND status_boss = 'Vivo'",
-                conn, params=(personagem_escolhido,)
-            )["total"][0]
-            mortos = pd.read_sql_query(
-                "SELECT COUNT(*) as total FROM jornada WHERE personagem = ? AND status_boss = 'Morto'",
-                conn, params=(personagem_escolhido,)
-            )["total"][0]
-
+        col1.metric("👹 Total de Bosses Únicos", vivos + mortos)
         col2.metric("😡 Bosses a sua espera", vivos)
         col3.metric("☠️ Bosses Exterminados", mortos)
 
         # === Preparação dos dados para o gráfico de barras ===
-        with sqlite3.connect(DB_PATH) as conn:
-            df_bar = pd.read_sql_query("""
-                SELECT level, status_boss, COUNT(*) as total
-                FROM jornada
-                WHERE personagem = ?
-                GROUP BY level, status_boss
-            """, conn, params=(personagem_escolhido,))
+        df_bar = df_resumo.groupby(["level", "level_ord", "status_boss"], as_index=False)["total"].sum()
 
         pivot_df = pd.DataFrame()
         if not df_bar.empty:
             pivot_df = df_bar.pivot_table(
-                index="level", columns="status_boss", values="total", fill_value=0
+                index=["level_ord", "level"], columns="status_boss", values="total", fill_value=0
             )
             pivot_df["total"] = pivot_df.sum(axis=1)
             for status in ["Vivo", "Morto"]:
@@ -237,8 +147,6 @@ else:
                     pivot_df[status] = 0
                 pivot_df[status + "_pct"] = (pivot_df[status] / pivot_df["total"]) * 100
             pivot_df = pivot_df.reset_index()
-            # Extrai prefixo numérico do nível para ordenação
-            pivot_df["level_ord"] = pivot_df["level"].str.extract(r"^(\d{2})").astype(float)
             pivot_df = pivot_df.sort_values(by="level_ord", ascending=False, na_position="last")
 
         # Gráficos e visualizações (continua igual...)
@@ -317,13 +225,12 @@ else:
         # === Linha 02: Gráfico de Barras Verticais (% por Localidade) ===
         st.markdown("### 🏙️ Distribuição por Localidade")
 
-        with sqlite3.connect(DB_PATH) as conn:
-            df_locais = pd.read_sql_query("""
-                SELECT localidade, status_boss, COUNT(*) as total
-                FROM jornada
-                WHERE personagem = ?
-                GROUP BY localidade, status_boss
-            """, conn, params=(personagem_escolhido,))
+        df_locais = df_resumo.groupby(["localidade", "status_boss"], as_index=False)[["total", "runes"]].sum()
+        # Ordem das localidades pelo menor level de seus bosses
+        ordem_locais = (
+            df_resumo.groupby("localidade", as_index=False)["level_ord"].min()
+            .sort_values(by="level_ord", na_position="last")
+        )
 
         if not df_locais.empty:
             # Total por localidade
@@ -333,11 +240,8 @@ else:
             df_locais = pd.merge(df_locais, total_por_local, on="localidade")
             df_locais["percentual"] = (df_locais["total"] / df_locais["total_local"]) * 100
 
-            # Extrai ordem do level para ordenação
-            with sqlite3.connect(DB_PATH) as conn:
-                levels = pd.read_sql_query("SELECT DISTINCT localidade, level FROM boss_levels", conn)
-            levels["level_ord"] = levels["level"].str.extract(r"^(\d+)").astype(float)
-            df_locais = pd.merge(df_locais, levels[["localidade", "level_ord"]], on="localidade", how="left")
+            # Ordem do level para ordenação
+            df_locais = pd.merge(df_locais, ordem_locais, on="localidade", how="left")
             df_locais = df_locais.sort_values(by="level_ord", na_position="last")
 
             # Gráfico com tooltips
@@ -353,6 +257,7 @@ else:
                     "status_boss": True,
                     "percentual": ':.2f',
                     "total": True,
+                    "runes": True,
                 },
                 barmode="stack",
                 color_discrete_map={
@@ -375,37 +280,14 @@ else:
         # === Gráfico de Boss por runas ===
         st.markdown("### 💰 Bosses por Quantidade de Runas")
 
-        # === Obtem localidades com level_ord para ordenação ===
-        with sqlite3.connect(DB_PATH) as conn:
-            localidades_df = pd.read_sql_query("""
-                SELECT DISTINCT j.localidade, bl.level
-                FROM jornada j
-                LEFT JOIN boss_levels bl
-                    ON LOWER(TRIM(j.localidade)) = LOWER(TRIM(bl.localidade))
-                WHERE j.personagem = ?
-            """, conn, params=(personagem_escolhido,))
-
-        # Extrai número de ordem (os dois primeiros dígitos) do level
-        localidades_df["level_ord"] = localidades_df["level"].str.extract(r"^(\d+)").astype(float)
-
-        # Ordena as localidades pela ordem do level
-        localidades_ordenadas = (
-            localidades_df.sort_values(by="level_ord", na_position="last")["localidade"]
-            .dropna()
-            .drop_duplicates()
-            .tolist()
-        )
+        # Localidades já ordenadas pelo level (do resumo)
+        localidades_ordenadas = ordem_locais["localidade"].dropna().tolist()
 
         # === Filtro ordenado ===
         localidade_escolhida = st.selectbox("📍 Filtrar por Localidade", localidades_ordenadas, key="filtro_localidade_runas")
 
         # === Consulta bosses da localidade com runas ===
-        with sqlite3.connect(DB_PATH) as conn:
-            df_runas = pd.read_sql_query("""
-                SELECT nome, runes
-                FROM jornada
-                WHERE personagem = ? AND localidade = ?
-            """, conn, params=(personagem_escolhido, localidade_escolhida))
+        df_runas = runas_por_localidade(personagem_id, localidade_escolhida)
 
         df_runas = df_runas.dropna(subset=["runes"]).sort_values(by="runes", ascending=False)
 
@@ -442,21 +324,20 @@ else:
         st.subheader(f"📋 Progresso de {personagem_escolhido} (Vivos ordenados por Level e Runas)")
 
         # === Carrega e filtra ===
-        with sqlite3.connect(DB_PATH) as conn:
-            df_jornada = pd.read_sql_query("""
-                SELECT * FROM jornada
-                WHERE personagem = ? AND status_boss = 'Vivo'
-            """, conn, params=(personagem_escolhido,))
+        fraco_a = st.multiselect("⚔️ Só bosses fracos a (qualquer um dos tipos)", list(TIPOS_DANO))
+        df_jornada = listar_bosses_vivos(personagem_id, mascara_de_tipos(fraco_a))
 
         # Verifica se 'localidade' está presente
         if "localidade" not in df_jornada.columns:
             st.warning("⚠️ A coluna 'localidade' não está presente na jornada.")
             st.stop()
 
-        # Ordena por level e runes
-        df_jornada["level_ord"] = df_jornada["level"].str.extract(r"^(\d{2})").astype(float)
-        df_jornada = df_jornada.sort_values(by=["level_ord", "runes"], ascending=[True, True])
-        df_jornada.drop(columns=["id", "level_ord"], errors="ignore", inplace=True)
+        # Já vem ordenada por level e runes
+        df_jornada.drop(
+            columns=["id", "personagem_id", "boss_id", "morto_em", "level_ord", "level_min", "level_max",
+                     "fraquezas", "resistencias"],
+            errors="ignore", inplace=True
+        )
         df_jornada.reset_index(drop=True, inplace=True)
 
         # === Estilo com gradiente por localidade ===
@@ -493,15 +374,7 @@ else:
         st.subheader("🔪 Atualizar Progresso de Bosses")
         st.text("Clique em Confirmar para aplicar filtro e salvar alteração.")
 
-        with sqlite3.connect(DB_PATH) as conn:
-            df_jornada_vivos = pd.read_sql_query("""
-                SELECT j.id, j.nome, j.localidade, j.status_boss, bl.level
-                FROM jornada j
-                LEFT JOIN boss_levels bl
-                    ON LOWER(TRIM(j.localidade)) = LOWER(TRIM(bl.localidade))
-                   AND LOWER(TRIM(j.nome)) = LOWER(TRIM(bl.nome))
-                WHERE j.personagem = ? AND j.status_boss = 'Vivo'
-            """, conn, params=(personagem_escolhido,))
+        df_jornada_vivos = listar_bosses_vivos_com_level(personagem_id)
 
         if df_jornada_vivos.empty:
             st.info("🎉 Todos os bosses deste personagem já foram exterminados!")
@@ -530,20 +403,11 @@ else:
 
                     if st.form_submit_button("✅ Confirmar") and confirmacao == "Sim":
                         
-                        with sqlite3.connect(DB_PATH) as conn:
-                            if nome_boss_escolhido == "Todos os Boss da Localidade":
-                                ids_para_atualizar = df_filtrado["id"].tolist()
-                                conn.executemany(
-                                    "UPDATE jornada SET status_boss = 'Morto' WHERE id = ?",
-                                    [(int(boss_id),) for boss_id in ids_para_atualizar]
-                                )
-                                st.success(f"Todos os bosses da localidade '{localidade_escolhida}' foram marcados como exterminados.")
-                            else:
-                                id_boss = df_filtrado[df_filtrado["nome"] == nome_boss_escolhido]["id"].values[0]
-                                conn.execute(
-                                    "UPDATE jornada SET status_boss = 'Morto' WHERE id = ?",
-                                    (int(id_boss),)
-                                )
-                                st.success(f"Boss '{nome_boss_escolhido}' foi marcado como exterminado.")
-                            conn.commit()
+                        if nome_boss_escolhido == "Todos os Boss da Localidade":
+                            marcar_bosses_mortos(personagem_id, df_filtrado["id"].tolist())
+                            st.success(f"Todos os bosses da localidade '{localidade_escolhida}' foram marcados como exterminados.")
+                        else:
+                            id_boss = df_filtrado[df_filtrado["nome"] == nome_boss_escolhido]["id"].values[0]
+                            marcar_bosses_mortos(personagem_id, [id_boss])
+                            st.success(f"Boss '{nome_boss_escolhido}' foi marcado como exterminado.")
                         st.rerun()
\ No newline at end of file
@@ -3,10 +3,11 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'Dados'))
 
-from db_seguranca import criar_tabela_usuarios, autenticar_usuario, cadastrar_usuario
+from db_bootstrap import inicializar_banco
+from repositorios.usuarios import autenticar_usuario, cadastrar_usuario
 
-# === Inicializa a tabela de usuários ===
-criar_tabela_usuarios()
+# === Inicializa o banco (migrações e catálogos) uma única vez por processo ===
+inicializar_banco()
 
 # --- Controle de autenticação e estado da sessão ---
 if 'autenticado' not in st.session_state: